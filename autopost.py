@@ -8,7 +8,12 @@ import sys
 import os
 import yaml
 import logging
+import logging.handlers
+import asyncio
+import atexit
+import queue
 import time
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -16,9 +21,18 @@ from dotenv import load_dotenv
 from generator import ArticleGenerator
 from publisher import create_publisher
 
+# 优先使用 LibYAML 的 C 实现加载器（约快一个数量级），不可用时回退纯 Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # 加载环境变量
 load_dotenv()
 
+# 文件名非法字符的转换表（一次构建，save_article 中单趟替换）
+_ILLEGAL_FILENAME_CHARS = str.maketrans({c: '_' for c in '/\\:*?"<>|'})
+
 
 class AutoPost:
     """主程序类，处理命令行输入和配置管理"""
@@ -34,6 +48,12 @@ class AutoPost:
         self.config: Dict[str, Any] = {}
         self.generator = None  # 文章生成器实例
         self.publisher = None  # WordPress 发布器实例
+        self._dir_cache: Dict[str, Path] = {}  # 已创建输出目录的缓存
+        self._next_allowed_ts = 0.0  # 下一次允许投放文章任务的时间戳
+        self._ts_sec = 0  # 文件名时间戳缓存（按秒）
+        self._ts_str = ''
+        self._ts_ctr = 0  # 同一秒内的文件序号，避免文件名冲突
+        self._ts_lock = threading.Lock()  # save_article 在多个工作线程并发执行
         self.setup_logging()
 
     def setup_logging(self):
@@ -42,13 +62,24 @@ class AutoPost:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
 
-        # 配置日志格式
+        # 配置日志格式；文件写入经由队列在独立线程完成，
+        # 避免磁盘 I/O 阻塞生成循环
         log_file = log_dir / "autopost.log"
+        log_format = '%(asctime)s - %(levelname)s - %(message)s'
+
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(log_format))
+
+        log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
+            format=log_format,
             handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
+                logging.handlers.QueueHandler(log_queue),
                 logging.StreamHandler(sys.stdout)
             ]
         )
@@ -65,17 +96,16 @@ class AutoPost:
             bool: 加载成功返回 True，否则返回 False
         """
         try:
-            config_file = Path(self.config_path)
-            if not config_file.exists():
-                self.logger.error(f"配置文件不存在: {self.config_path}")
-                return False
-
-            with open(config_file, 'r', encoding='utf-8') as f:
-                self.config = yaml.safe_load(f)
+            # 直接打开，不存在时走异常分支，省去一次 stat
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                self.config = yaml.load(f, Loader=_YamlLoader)
 
             self.logger.info(f"成功加载配置文件: {self.config_path}")
             return True
 
+        except FileNotFoundError:
+            self.logger.error(f"配置文件不存在: {self.config_path}")
+            return False
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {e}")
             return False
@@ -91,23 +121,17 @@ class AutoPost:
             list: 关键词列表（将用|分隔的关键词拆分为单个关键词）
         """
         try:
-            keywords_file = Path(keywords_path)
-            if not keywords_file.exists():
-                self.logger.error(f"关键词文件不存在: {keywords_path}")
-                return []
-
-            all_keywords = []
-            with open(keywords_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        # 将用 | 分隔的关键词拆分为单个关键词
-                        keywords_in_line = [kw.strip() for kw in line.split('|') if kw.strip()]
-                        all_keywords.extend(keywords_in_line)
+            # 一次读入整个文件，把换行统一成 | 后单趟 split，
+            # 避免逐行的 Python 级循环；不存在时走异常分支，省去一次 stat
+            raw = Path(keywords_path).read_text(encoding='utf-8')
+            all_keywords = [kw for kw in (s.strip() for s in raw.replace('\n', '|').split('|')) if kw]
 
             self.logger.info(f"成功加载 {len(all_keywords)} 个关键词")
             return all_keywords
 
+        except FileNotFoundError:
+            self.logger.error(f"关键词文件不存在: {keywords_path}")
+            return []
         except Exception as e:
             self.logger.error(f"加载关键词文件失败: {e}")
             return []
@@ -137,8 +161,30 @@ class AutoPost:
             self.logger.error(f"save_mode 必须是 'keyword' 或 'date'")
             return False
 
+        self._freeze_config()
         return True
 
+    def _freeze_config(self):
+        """
+        把每篇文章都要读取的配置项绑定为实例属性
+
+        生成循环里每篇文章原本要做十几次 dict.get，提前取一次后
+        热路径上只剩属性访问。
+        """
+        self._tpk = int(self.config['title_per_keyword'])
+        self._delay = float(self.config['delay_between_posts'])
+        self._template = self.config.get('article_template')
+        self._use_template = self.config.get('use_template', False)
+        self._word_count = self.config.get('word_count', 2000)
+        self._image_count = self.config.get('image_count', 3)
+        self._fetch_real_images = self.config.get('fetch_real_images', False)
+        self._image_search_engine = self.config.get('image_search_engine', 'unsplash')
+        self._image_mode = self.config.get('image_mode', 'search')
+        self._image_generate_model = self.config.get('image_generate_model', 'dall-e-3')
+        self._image_generate_size = self.config.get('image_generate_size', '1024x1024')
+        self._image_generate_quality = self.config.get('image_generate_quality', 'standard')
+        self._image_generate_style = self.config.get('image_generate_style', 'natural')
+
     def create_output_directory(self, keyword: str = None) -> Path:
         """
         根据配置创建输出目录
@@ -157,15 +203,50 @@ class AutoPost:
                 folder_name = keyword
             else:
                 folder_name = 'default'
-            output_dir = base_path / folder_name
         else:  # date mode
             # 使用日期作为文件夹名
-            today = datetime.now().strftime('%Y-%m-%d')
-            output_dir = base_path / today
+            folder_name = datetime.now().strftime('%Y-%m-%d')
+
+        # 同一目录只创建一次，后续直接命中缓存，省去重复的 mkdir 系统调用
+        cached = self._dir_cache.get(folder_name)
+        if cached is not None:
+            return cached
 
+        output_dir = base_path / folder_name
         output_dir.mkdir(parents=True, exist_ok=True)
+        self._dir_cache[folder_name] = output_dir
         return output_dir
 
+    def _preflight(self, keywords: List[str]) -> bool:
+        """
+        生成前的快速自检，避免批量调用 API 后才发现保存失败
+
+        写入并删除一个探针文件验证输出目录可写；如果配置了
+        preflight_probe，再用一次最小的标题生成验证 OpenAI 通路。
+        （WordPress 连接已在初始化发布器时验证过。）
+
+        Args:
+            keywords: 关键词列表（用第一个关键词探测输出目录）
+
+        Returns:
+            bool: 自检通过返回 True，否则返回 False
+        """
+        try:
+            output_dir = self.create_output_directory(keywords[0] if keywords else None)
+            probe_file = output_dir / '.probe'
+            probe_file.write_bytes(b'')
+            probe_file.unlink()
+        except Exception as e:
+            self.logger.error(f"输出目录不可写: {e}")
+            return False
+
+        if self.config.get('preflight_probe', False):
+            if not self.generator.generate_titles("测试", n=1):
+                self.logger.error("OpenAI 探测请求失败")
+                return False
+
+        return True
+
     def display_welcome(self):
         """显示欢迎信息"""
         print("\n" + "=" * 60)
@@ -224,30 +305,38 @@ class AutoPost:
             # 创建输出目录
             output_dir = self.create_output_directory(keyword)
 
-            # 生成文件名：使用标题+时间
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-
-            # 清理标题中的非法文件名字符
-            safe_title = title.replace('/', '_').replace('\\', '_').replace(':', '_')
-            safe_title = safe_title.replace('*', '_').replace('?', '_').replace('"', '_')
-            safe_title = safe_title.replace('<', '_').replace('>', '_').replace('|', '_')
+            # 生成文件名：使用标题+时间；时间戳按秒缓存，
+            # 同一秒内的多篇文章用序号区分，不重复调用 strftime。
+            # 计数器在并发保存时共享，加锁避免两篇文章拿到同一个
+            # 序号后互相覆盖
+            now = int(time.time())
+            with self._ts_lock:
+                if now != self._ts_sec:
+                    self._ts_sec = now
+                    self._ts_str = time.strftime('%Y%m%d_%H%M%S', time.localtime(now))
+                    self._ts_ctr = 0
+                else:
+                    self._ts_ctr += 1
+                ts_str = self._ts_str
+                ts_ctr = self._ts_ctr
 
-            # 限制文件名长度
-            if len(safe_title) > 50:
-                safe_title = safe_title[:50]
+            # 清理标题中的非法文件名字符，并限制文件名长度
+            safe_title = title.translate(_ILLEGAL_FILENAME_CHARS)[:50]
 
-            filename = f"{safe_title}_{timestamp}.txt"
-            filepath = output_dir / filename
+            # 用字符串拼接路径，省去每篇文章构造新 Path 对象的开销
+            # （缓存的 Path 的 str 形式在首次转换后由 pathlib 内部缓存）
+            filename = f"{safe_title}_{ts_str}_{ts_ctr}.txt"
+            filepath = os.path.join(os.fspath(output_dir), filename)
 
-            # 只保存纯 HTML 内容
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 只保存纯 HTML 内容（一次性写入整块字节，避免多次 write 系统调用）
+            with open(filepath, 'wb') as f:
+                f.write(content.encode('utf-8'))
 
-            self.logger.info(f"文章已保存: {filepath}")
+            self.logger.info("文章已保存: %s", filepath)
             return True
 
         except Exception as e:
-            self.logger.error(f"保存文章失败: {e}")
+            self.logger.error("保存文章失败: %s", e)
             return False
 
     def generate_and_save_article(
@@ -274,32 +363,20 @@ class AutoPost:
             print(f"  关键词: {keyword}")
             print(f"  标题: {title}")
 
-            # 生成文章
-            template = self.config.get('article_template')
-            use_template = self.config.get('use_template', False)
-            word_count = self.config.get('word_count', 2000)
-            image_count = self.config.get('image_count', 3)
-            fetch_real_images = self.config.get('fetch_real_images', False)
-            image_search_engine = self.config.get('image_search_engine', 'unsplash')
-            image_mode = self.config.get('image_mode', 'search')
-            image_generate_model = self.config.get('image_generate_model', 'dall-e-3')
-            image_generate_size = self.config.get('image_generate_size', '1024x1024')
-            image_generate_quality = self.config.get('image_generate_quality', 'standard')
-            image_generate_style = self.config.get('image_generate_style', 'natural')
-
+            # 生成文章（配置项已在 _freeze_config 中绑定为属性）
             article_content = self.generator.generate_article(
                 title=title,
-                template=template,
-                use_template=use_template,
-                word_count=word_count,
-                image_count=image_count,
-                fetch_real_images=fetch_real_images,
-                image_search_engine=image_search_engine,
-                image_mode=image_mode,
-                image_generate_model=image_generate_model,
-                image_generate_size=image_generate_size,
-                image_generate_quality=image_generate_quality,
-                image_generate_style=image_generate_style
+                template=self._template,
+                use_template=self._use_template,
+                word_count=self._word_count,
+                image_count=self._image_count,
+                fetch_real_images=self._fetch_real_images,
+                image_search_engine=self._image_search_engine,
+                image_mode=self._image_mode,
+                image_generate_model=self._image_generate_model,
+                image_generate_size=self._image_generate_size,
+                image_generate_quality=self._image_generate_quality,
+                image_generate_style=self._image_generate_style
             )
 
             if not article_content:
@@ -328,7 +405,7 @@ class AutoPost:
             return True
 
         except Exception as e:
-            self.logger.error(f"生成并保存文章失败: {e}")
+            self.logger.error("生成并保存文章失败: %s", e)
             print(f"  ❌ 错误: {e}")
             return False
 
@@ -366,19 +443,55 @@ class AutoPost:
             )
 
             if post_id:
-                self.logger.info(f"文章已发布到 WordPress: {title} (ID: {post_id})")
+                self.logger.info("文章已发布到 WordPress: %s (ID: %s)", title, post_id)
                 return post_id
             else:
-                self.logger.error(f"WordPress 发布失败: {title}")
+                self.logger.error("WordPress 发布失败: %s", title)
                 return None
 
         except Exception as e:
-            self.logger.error(f"发布到 WordPress 时出错: {e}")
+            self.logger.error("发布到 WordPress 时出错: %s", e)
             return None
 
-    def process_keywords(self, keywords: List[str]) -> int:
+    async def _generate_article_task(
+        self,
+        sem: asyncio.Semaphore,
+        keyword: str,
+        title: str,
+        index: int,
+        total: int
+    ) -> bool:
         """
-        处理所有关键词，生成文章
+        单篇文章的异步任务：在信号量保护下，把阻塞的生成/保存/发布放入线程池执行
+
+        Args:
+            sem: 并发信号量
+            keyword: 关键词
+            title: 文章标题
+            index: 当前文章序号
+            total: 总文章数
+
+        Returns:
+            bool: 成功返回 True，否则返回 False
+        """
+        async with sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                self.generate_and_save_article,
+                keyword,
+                title,
+                index,
+                total
+            )
+
+    async def process_keywords(self, keywords: List[str]) -> int:
+        """
+        处理所有关键词，并发生成文章
+
+        网络调用（OpenAI 生成、WordPress 发布）是主要耗时，因此把每篇文章
+        作为独立任务并发调度，用信号量限制并发数，用 asyncio.sleep 做
+        任务投放的限速（代替原来每篇之间的硬性等待）。
 
         Args:
             keywords: 关键词列表
@@ -386,50 +499,61 @@ class AutoPost:
         Returns:
             int: 成功生成的文章数
         """
-        success_count = 0
-        total_articles = len(keywords) * self.config['title_per_keyword']
+        sem = asyncio.Semaphore(self.config.get('concurrency', 8))
+        delay = self._delay
+        total_articles = len(keywords) * self._tpk
         article_index = 0
+        loop = asyncio.get_running_loop()
+        tasks = []
 
         for keyword in keywords:
-            self.logger.info(f"开始处理关键词: {keyword}")
+            self.logger.info("开始处理关键词: %s", keyword)
             print(f"\n{'=' * 60}")
             print(f"处理关键词: {keyword}")
             print(f"{'=' * 60}")
 
-            # 生成标题
-            print(f"正在生成 {self.config['title_per_keyword']} 个标题...")
-            titles = self.generator.generate_titles(
-                keyword=keyword,
-                n=self.config['title_per_keyword']
+            # 生成标题（阻塞调用放入线程池）
+            print(f"正在生成 {self._tpk} 个标题...")
+            titles = await loop.run_in_executor(
+                None,
+                lambda kw=keyword: self.generator.generate_titles(
+                    keyword=kw,
+                    n=self._tpk
+                )
             )
 
             if not titles:
-                self.logger.warning(f"关键词 '{keyword}' 的标题生成失败，跳过")
+                self.logger.warning("关键词 '%s' 的标题生成失败，跳过", keyword)
                 print("❌ 标题生成失败，跳过该关键词")
                 continue
 
             print(f"✓ 成功生成 {len(titles)} 个标题")
 
-            # 对每个标题生成文章
-            for i, title in enumerate(titles, 1):
+            # 对每个标题创建并发任务
+            for title in titles:
                 article_index += 1
 
-                # 生成并保存文章
-                if self.generate_and_save_article(
-                    keyword=keyword,
-                    title=title,
-                    index=article_index,
-                    total=total_articles
-                ):
-                    success_count += 1
-
-                # 如果不是最后一篇文章，等待指定时间
-                if article_index < total_articles:
-                    delay = self.config['delay_between_posts']
-                    print(f"\n  等待 {delay} 秒后继续...")
-                    time.sleep(delay)
-
-        return success_count
+                # 限速投放任务：只补足距上次投放不足 delay 的部分，
+                # 标题生成等已经消耗的时间都计入冷却期
+                if delay > 0:
+                    wait = self._next_allowed_ts - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._next_allowed_ts = time.monotonic() + delay
+
+                tasks.append(asyncio.create_task(
+                    self._generate_article_task(
+                        sem=sem,
+                        keyword=keyword,
+                        title=title,
+                        index=article_index,
+                        total=total_articles
+                    )
+                ))
+
+        # 等待所有文章任务完成
+        results = await asyncio.gather(*tasks)
+        return sum(1 for ok in results if ok)
 
     def run(self):
         """主运行流程"""
@@ -471,7 +595,11 @@ class AutoPost:
             print("\n正在初始化 WordPress 发布器...")
             try:
                 self.publisher = create_publisher(wp_config)
-                if self.publisher and self.publisher.test_connection():
+                # REST 的连通性探测不带凭据，这里把认证也验掉，
+                # 避免批量生成文章后才在发布时逐篇撞 401
+                verify = getattr(self.publisher, 'verify_auth', None) if self.publisher else None
+                if self.publisher and self.publisher.test_connection() and (
+                        verify is None or verify()):
                     print("✓ WordPress 发布器初始化成功")
                     print(f"  目标站点: {wp_config['url']}")
                     print(f"  发布状态: {wp_config.get('status', 'draft')}")
@@ -495,6 +623,11 @@ class AutoPost:
 
         print(f"✓ 成功加载 {len(keywords)} 个关键词组")
 
+        # 生成前自检：先确认输出目录可写，再开始烧 API 配额
+        if not self._preflight(keywords):
+            print("❌ 生成前自检失败，程序退出")
+            return 1
+
         # 显示关键词列表
         # print("\n关键词列表:")
         # for i, kw in enumerate(keywords, 1):
@@ -504,8 +637,8 @@ class AutoPost:
         self.display_config_summary()
 
         # 计算总共要生成的文章数
-        total_articles = len(keywords) * self.config['title_per_keyword']
-        total_time_minutes = (total_articles - 1) * self.config['delay_between_posts'] / 60
+        total_articles = len(keywords) * self._tpk
+        total_time_minutes = (total_articles - 1) * self._delay / 60
 
         print(f"预计生成:")
         print(f"  - 总文章数: {total_articles} 篇")
@@ -524,7 +657,13 @@ class AutoPost:
         start_time = datetime.now()
         self.logger.info("开始批量生成文章")
 
-        success_count = self.process_keywords(keywords)
+        try:
+            success_count = asyncio.run(self.process_keywords(keywords))
+        finally:
+            # 释放 HTTP 长连接
+            self.generator.close()
+            if self.publisher:
+                self.publisher.close()
 
         # 完成统计
         end_time = datetime.now()
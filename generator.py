@@ -4,23 +4,467 @@ Generator - ChatGPT 文章生成模块
 负责生成标题和文章内容
 """
 
+from __future__ import annotations
+
 import os
 import re
+import json
+import time
+import random
+import hashlib
 import logging
-import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict
-from openai import OpenAI
+
+# requests 与 openai 都较重（冷导入各 ~100ms），推迟到实际构造
+# 会话/客户端时再导入，只读取常量或工具函数的调用方不必付这笔开销
+
+# httpx 支持 HTTP/2 多路复用，优先使用；不可用时回退 requests.Session
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# pyahocorasick 把禁用词检查压缩为对文本的单趟扫描；不可用时回退逐词 in 匹配
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# orjson 的 C 实现解析比标准库 json 快数倍；不可用时回退标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(response):
+    """解析 HTTP 响应的 JSON（orjson 可用时走 C 实现）"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# 行首可能出现的编号字符（"1. " "2、" "- " 等）
+_STRIP_CHARS = '0123456789.、 -'
+
+
+def _parse_lines(content: str) -> List[str]:
+    """按行拆分 LLM 返回内容，单趟去除空行与行首编号"""
+    return [
+        s for s in (line.strip().lstrip(_STRIP_CHARS) for line in content.splitlines())
+        if s
+    ]
+
+
+# 按 (api_key, api_base) 复用 OpenAI 客户端：每个客户端自带连接池，
+# 多个生成器实例共享同一配置时不再重复付 TLS 握手成本。
+# OpenAI SDK 客户端是线程安全的，跨实例共享没有问题。
+_OPENAI_CLIENTS: Dict[tuple, "OpenAI"] = {}
+
+
+def _get_openai_client(api_key: str, api_base: Optional[str]) -> "OpenAI":
+    """获取（必要时创建）指定配置的共享 OpenAI 客户端"""
+    key = (api_key, api_base)
+    client = _OPENAI_CLIENTS.get(key)
+    if client is None:
+        from openai import OpenAI
+
+        client_kwargs = {"api_key": api_key}
+        if api_base:
+            client_kwargs["base_url"] = api_base
+        client = OpenAI(**client_kwargs)
+        _OPENAI_CLIENTS[key] = client
+    return client
+
+# 标题/正文中要避免的"AI 感"词汇（跨调用不变，模块加载时拼接一次）
+_UNNATURAL_TITLE_WORDS = ', '.join([
+    "深入探讨", "揭秘", "探索", "揭开", "完美", "深入剖析",
+    "深入分析", "深入了解", "剖析", "深入", "终极指南", "全面解析", "带你了解"
+])
+
+# _clean_html_structure 用到的正则，模块加载时编译一次；
+# 文档结构标签合并为一个交替模式，一趟 sub 全部去掉
+_BODY_RE = re.compile(r'<body[^>]*>(.*)</body>', re.DOTALL | re.IGNORECASE)
+_STRUCTURE_RE = re.compile(
+    r'<!DOCTYPE[^>]*>|<html[^>]*>|</html>|<head[^>]*>.*?</head>'
+    r'|<body[^>]*>|</body>|<meta[^>]*>|<title[^>]*>.*?</title>',
+    re.DOTALL | re.IGNORECASE
+)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+
+# 图片占位符匹配（_replace_image_placeholders 单趟替换用）
+_PLACEHOLDER_RE = re.compile(r'<img\s+src="?\[IMAGE_PLACEHOLDER[^\]]*\]"?\s+alt="([^"]*)"')
+
+_UNNATURAL_WORDS = ', '.join([
+    "深入探讨", "揭秘", "探索", "揭开", "完美", "深入剖析",
+    "深入分析", "深入了解", "剖析", "深入", "引言", "总结",
+    "结语", "概括", "综上所述", "首先", "其次", "最后",
+    "从而", "因此可见", "在这篇文章中", "本文将", "让我们一起"
+])
+
+
+class LLMCache:
+    """LLM 响应的本地缓存（内存字典 + 磁盘 JSON 文件）
+
+    相同请求直接返回本地结果，省去数秒的付费 API 往返。
+    """
+
+    def __init__(self, cache_dir: str = "./data/llm_cache"):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self._mem: Dict[str, str] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        """根据请求参数计算稳定的缓存键"""
+        if orjson is not None:
+            raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        else:
+            raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """查询缓存，未命中返回 None"""
+        content = self._mem.get(key)
+        if content is not None:
+            return content
+
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json'), 'r', encoding='utf-8') as f:
+                content = json.load(f)['content']
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+        self._mem[key] = content
+        return content
+
+    def set(self, key: str, content: str):
+        """写入缓存（内存 + 磁盘）"""
+        self._mem[key] = content
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json'), 'w', encoding='utf-8') as f:
+                json.dump({'content': content}, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"写入 LLM 缓存失败: {e}")
+
+
+class ImageURLCache:
+    """图片 URL 的本地缓存（内存字典 + 磁盘 JSON 文件，带过期时间）
+
+    相同标题与图片参数的重复请求直接复用 URL 列表，省去重复的
+    DALL-E 生成费用或搜索 API 往返。DALL-E 返回的 URL 约一小时后
+    失效，因此 generate/mixed 模式的条目用较短的过期时间。
+    """
+
+    # generate/mixed 模式的 DALL-E URL 约 1 小时失效，留出安全余量
+    GENERATE_TTL = 3000
+    # 搜索引擎返回的是稳定的 CDN URL，可以缓存数天
+    SEARCH_TTL = 7 * 86400
+
+    def __init__(self, cache_dir: str = "./data/image_cache"):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self._mem: Dict[str, Dict] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key: str, ttl: float) -> Optional[List[str]]:
+        """查询缓存，未命中或已过期返回 None"""
+        entry = self._mem.get(key)
+        if entry is None:
+            try:
+                with open(os.path.join(self.cache_dir, key + '.json'), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, ValueError):
+                return None
+            self._mem[key] = entry
+
+        if time.time() - entry.get('ts', 0) > ttl:
+            return None
+        return entry.get('urls')
+
+    def set(self, key: str, urls: List[str]):
+        """写入缓存（内存 + 磁盘）"""
+        entry = {'ts': time.time(), 'urls': urls}
+        self._mem[key] = entry
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json'), 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"写入图片缓存失败: {e}")
+
+
+class SemanticCache:
+    """基于 embedding 相似度的语义缓存
+
+    近似重复的关键词/标题（如"AI工具"与"AI 工具推荐"）即使精确缓存未命中，
+    也可以复用此前的响应：一次约 50ms 的 embedding 调用加内存内的
+    余弦相似度检索，替代数秒的 chat 调用。按方法命名空间隔离，避免
+    标题缓存污染图片关键词缓存。
+    """
+
+    def __init__(
+        self,
+        client,
+        cache_dir: str = "./data/semantic_cache",
+        embedding_model: str = "text-embedding-3-small",
+        threshold: float = 0.88
+    ):
+        """
+        初始化语义缓存
+
+        Args:
+            client: OpenAI 客户端或返回客户端的零参可调用对象
+                （用于计算 embedding；传可调用对象可推迟客户端构建）
+            cache_dir: 磁盘持久化目录
+            embedding_model: embedding 模型
+            threshold: 余弦相似度命中阈值
+        """
+        self.logger = logging.getLogger(__name__)
+        self._client = client
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+        self._embs: Dict[str, np.ndarray] = {}  # namespace -> (N, dim) 单位向量
+        self._responses: Dict[str, list] = {}  # namespace -> 对应响应列表
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """从磁盘恢复各命名空间的向量和响应"""
+        try:
+            for fn in os.listdir(self.cache_dir):
+                if not fn.endswith('.npy'):
+                    continue
+                ns = fn[:-4]
+                embs = np.load(os.path.join(self.cache_dir, fn))
+                with open(os.path.join(self.cache_dir, ns + '.json'), 'r', encoding='utf-8') as f:
+                    responses = json.load(f)
+                if len(responses) == embs.shape[0]:
+                    self._embs[ns] = embs
+                    self._responses[ns] = responses
+        except Exception as e:
+            self.logger.warning(f"加载语义缓存失败: {e}")
+
+    def _embed(self, text: str) -> np.ndarray:
+        """计算文本的单位 embedding 向量"""
+        client = self._client() if callable(self._client) else self._client
+        response = client.embeddings.create(
+            model=self.embedding_model,
+            input=text
+        )
+        vec = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def lookup(self, namespace: str, text: str):
+        """
+        查询语义缓存
+
+        Args:
+            namespace: 命名空间（按调用方法隔离）
+            text: 查询文本
+
+        Returns:
+            tuple: (命中的响应或 None, 查询向量或 None)；
+                   向量返回给调用方，命中失败后写入时无需重新计算
+        """
+        try:
+            emb = self._embed(text)
+        except Exception as e:
+            self.logger.warning(f"计算 embedding 失败: {e}")
+            return None, None
+
+        embs = self._embs.get(namespace)
+        if embs is None or embs.shape[0] == 0:
+            return None, emb
+
+        scores = embs @ emb
+        best = int(scores.argmax())
+        if scores[best] >= self.threshold:
+            self.logger.info(f"命中语义缓存 (相似度: {scores[best]:.3f})")
+            return self._responses[namespace][best], emb
+
+        return None, emb
+
+    def store(self, namespace: str, emb, response):
+        """写入新的 (向量, 响应) 对并持久化到磁盘"""
+        if emb is None:
+            return
+
+        embs = self._embs.get(namespace)
+        if embs is None:
+            self._embs[namespace] = emb.reshape(1, -1)
+            self._responses[namespace] = [response]
+        else:
+            self._embs[namespace] = np.vstack([embs, emb])
+            self._responses[namespace].append(response)
+
+        try:
+            np.save(os.path.join(self.cache_dir, namespace + '.npy'), self._embs[namespace])
+            with open(os.path.join(self.cache_dir, namespace + '.json'), 'w', encoding='utf-8') as f:
+                json.dump(self._responses[namespace], f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"写入语义缓存失败: {e}")
 
 
 class ArticleGenerator:
     """文章生成器类"""
 
+    # 固定的 system 提示与提示词骨架：类定义时构建一次，
+    # 每次调用只做变量部分的 format 替换
+    _SYS_TITLE = "你是一个擅长自然写作的内容创作者，能写出真实、有温度、不套路的标题。避免使用AI感强、营销腔的表达方式。"
+    _SYS_ARTICLE = "你是一个擅长自然写作的内容创作者，能写出真实、有温度、不套路的文章。你的文章应该像真人在分享经验和见解，语气轻松自然，避免使用AI感强、营销腔、官方腔的表达方式。文章使用HTML格式排版。"
+    _SYS_IMAGE_KEYWORDS = "你是一个专业的图片搜索专家，擅长将中文主题转化为准确的英文图片搜索关键词。"
+    _SYS_IMAGE_PROMPTS = "你是一个专业的 DALL-E 提示词工程师，擅长将中文主题转化为高质量的英文图片生成提示词。"
+
+    _TITLE_PROMPT_TEMPLATE = """请根据以下关键词生成 {ask_n} 个自然风格的中文文章标题。关键词需自然融入，不要堆叠。
+
+关键词: {keyword}
+
+标题风格要求：
+1. 标题需自动匹配所属领域（科技、影视、数码、知识科普）的常见写作语气：
+   - 科技：理性、直接、信息清晰
+   - 数码：偏体验感、真实使用感受
+   - 影视：情绪化、更具画面感
+   - 科普：易懂、自然、亲切、不装腔
+2. 避免AI感很强的词汇: {unnatural}
+3. 不使用营销腔、官方腔的表达，例如：终极指南、深度解析、全面总结这类词汇
+4. 可以带些个人感受或真实体验感
+5. 标题长度控制在15-30字之间
+6. 适合SEO，关键词要自然融入句子里，但不要生硬堆砌关键词{forbidden_hint}
+7. 标题要兼容 Google + 百度SEO，但同时保持自然表达。
+标题示例（自然 vs 生硬）：
+❌ 不好: "深入探讨AI工具的完美应用"
+✅ 好: "2025年可免费使用的10多种AI工具"
+
+❌ 不好: "全面解析Python编程技巧"
+✅ 好: "【Python教程】《零基础入门学习Python》最新版"
+
+请直接返回 {ask_n} 个标题，每行一个，不要添加编号或其他说明:"""
+
+    _IMAGE_KEYWORDS_TEMPLATE = """请根据以下文章标题，生成 {count} 个适合搜索图片的英文关键词。
+
+文章标题: {title}
+
+要求:
+1. 关键词要能准确反映文章的主题和内容
+2. 使用简洁的英文单词或短语（2-4个词）
+3. 适合在图片搜索引擎中使用
+4. 每个关键词应该独特，从不同角度描述主题
+5. 直接返回 {count} 个关键词，每行一个，不要添加编号或其他说明
+
+示例：
+如果标题是"AI工具推荐"，关键词可以是：
+artificial intelligence technology
+digital innovation workspace
+modern tech tools
+
+请生成关键词:"""
+
+    _IMAGE_PROMPTS_TEMPLATE = """请根据以下文章标题，生成 {count} 个适合 DALL-E 图片生成的英文提示词。
+
+文章标题: {title}
+
+要求:
+1. 提示词要详细描述期望的图片场景和风格
+2. 使用清晰、具体的英文描述（一句话，15-30个词）
+3. 包含主题、风格、构图等元素
+4. 适合生成专业、高质量的配图
+5. 直接返回 {count} 个提示词，每行一个，不要添加编号或其他说明
+
+示例：
+如果标题是"AI工具推荐"，提示词可以是：
+A modern workspace with AI technology, featuring holographic displays and futuristic interfaces, professional photography style, clean and minimalist
+Digital illustration of artificial intelligence neural network, vibrant colors, abstract tech pattern, high-tech atmosphere
+Realistic photo of a person using AI software on laptop, bright office environment, professional business setting
+
+请生成提示词:"""
+
+    _ARTICLE_PROMPT_TEMPLATE = """请根据以下标题撰写一篇自然、真实、有温度的中文文章。
+
+标题: {title}
+
+写作风格要求：
+1. 像一个真实的人在分享经验和见解，语气轻松自然
+2. 使用日常对话的语言，避免官方腔调和营销话术
+3. 可以用"我""你""咱们"等第一、第二人称，增加亲切感
+4. 适当使用口语化表达，让文章读起来更生动
+5. 避免使用这些AI感很强的词汇: {unnatural}
+
+内容要求：
+1. HTML标签格式排版:
+   - 段落使用 <p> 标签
+   - 小标题使用 <h2> 或 <h3> 标签（标题要自然、口语化）
+   - 重要内容可使用 <strong> 或 <em> 强调
+   - 列表使用 <ul> 和 <li> 标签
+   - 不要生成完整的 HTML 文档结构（如 <!DOCTYPE>, <html>, <head>, <body> 等标签）
+   - 只生成文章内容部分的 HTML
+
+2. 内容质量:
+   - 原创内容，有独特见解
+   - 逻辑自然流畅，不要生硬分段
+   - 目标字数约 {word_count} 字{forbidden_hint}
+
+3. 文章结构（但不要显式标注）:
+   - 开头自然切入主题，直接开始讲内容，不要写"在这篇文章中"之类的套话
+   - 中间部分自然展开，用 2-4 个小标题组织内容，小标题要口语化、有吸引力
+   - 结尾自然收束，可以是建议、展望或个人感受，不要用"总结""综上所述"
+
+4. 图片占位符:
+   - 在合适的位置插入 {image_count} 个图片占位符
+   - 格式: <img src="[IMAGE_PLACEHOLDER]" alt="相关描述">
+   - 图片描述要自然、具体，符合上下文
+
+5. 具体示例（如何自然表达）:
+   ❌ 不好: "首先，我们需要了解..."
+   ✅ 好: "说到这个，其实..."
+
+   ❌ 不好: "综上所述，我们可以得出结论..."
+   ✅ 好: "讲了这么多，你可能已经发现了..."
+
+   ❌ 不好: "本文将深入探讨AI工具的应用..."
+   ✅ 好: "最近用了不少AI工具，有些真的挺好用..."
+"""
+
+    _ARTICLE_PROMPT_TAIL = "\n请开始创作（仅返回文章内容的HTML，不要包含 <!DOCTYPE>、<html>、<head>、<body> 等文档结构标签，也不要添加任何说明或注释）:"
+
+    _SYS_SEO = "你是一个SEO专家，擅长撰写吸引人的meta描述。"
+
+    _SEO_PROMPT_TEMPLATE = """请根据以下文章标题和内容，生成一段SEO友好的描述文本。
+
+标题: {title}
+
+要求:
+1. 描述长度控制在 {max_length} 字符以内
+2. 包含关键信息和关键词
+3. 吸引用户点击
+4. 语言简洁明了
+5. 直接返回描述文本，不要包含其他说明
+
+请生成SEO描述:"""
+
     def __init__(
         self,
         api_key: str = None,
         model: str = "gpt-4-turbo",
         api_base: str = None,
-        forbidden_words: List[str] = None
+        forbidden_words: List[str] = None,
+        session: requests.Session = None,
+        semantic_threshold: float = 0.88
     ):
         """
         初始化文章生成器
@@ -30,9 +474,29 @@ class ArticleGenerator:
             model: 使用的 OpenAI 模型
             api_base: 自定义 API 端点（如果为 None，从环境变量获取）
             forbidden_words: 禁止出现的词汇列表
+            session: 复用的 requests.Session（如果为 None，内部创建）
+            semantic_threshold: 语义缓存的相似度命中阈值
         """
         self.logger = logging.getLogger(__name__)
 
+        # 图片搜索等 HTTP 请求复用同一个长连接会话，省去每次的 TCP+TLS 握手；
+        # httpx 可用时启用 HTTP/2，多个并发搜索复用同一条连接
+        if session is None:
+            if httpx is not None:
+                session = httpx.Client(
+                    http2=True,
+                    timeout=10.0,
+                    follow_redirects=True,  # 与 requests 的默认行为对齐
+                    limits=httpx.Limits(max_keepalive_connections=20)
+                )
+            else:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+                session.mount('https://', adapter)
+        self.session = session
+
         # 获取 API 密钥
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -41,20 +505,207 @@ class ArticleGenerator:
         # 获取自定义 API 端点
         self.api_base = api_base or os.getenv("OPENAI_API_BASE")
 
-        # 初始化 OpenAI 客户端
-        client_kwargs = {"api_key": self.api_key}
+        # OpenAI 客户端按需构建（client 属性首次访问时才创建），
+        # 同配置的实例共享同一个客户端
         if self.api_base:
-            client_kwargs["base_url"] = self.api_base
             self.logger.info(f"使用自定义 API 端点: {self.api_base}")
-
-        self.client = OpenAI(**client_kwargs)
         self.model = model
-        self.forbidden_words = forbidden_words or []
+        self.forbidden_words = []
+
+        # 常驻线程池：文章正文与图片获取并行，重复调用不付线程创建成本
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+        # 本地 LLM 响应缓存，相同请求不再重复计费
+        self._llm_cache = LLMCache()
+
+        # 图片 URL 缓存：相同标题与参数的重复生成直接复用
+        self._image_cache = ImageURLCache()
+
+        # 语义缓存：近似重复的关键词/标题复用此前的响应
+        self.semantic_threshold = semantic_threshold
+        self._semantic_cache = SemanticCache(lambda: self.client, threshold=semantic_threshold)
+
+        # 构建禁用词索引（小写表、滚动窗口长度、首字符预筛、自动机、提示词片段）
+        self.set_forbidden_words(forbidden_words or [])
 
         self.logger.info(f"ArticleGenerator 初始化完成，使用模型: {self.model}")
         if self.forbidden_words:
             self.logger.info(f"已设置 {len(self.forbidden_words)} 个禁用词")
 
+    @property
+    def client(self) -> "OpenAI":
+        """共享的 OpenAI 客户端（首次访问时构建）"""
+        return _get_openai_client(self.api_key, self.api_base)
+
+    def set_forbidden_words(self, forbidden_words: List[str]):
+        """
+        替换禁用词列表并重建全部派生索引
+
+        运行中换词表时调用；自动机、首字符预筛集合和提示词片段
+        只在这里重建一次，扫描热路径上不做任何检查。
+
+        Args:
+            forbidden_words: 新的禁用词列表
+        """
+        self.forbidden_words = forbidden_words or []
+
+        # 预构建跨标题不变的提示词片段和小写禁用词表，
+        # 生成循环里不再重复拼接/转换
+        self._forbidden_words_lower = [w.lower() for w in self.forbidden_words]
+
+        # 最长禁用词长度（流式扫描的滚动窗口大小）
+        self._max_forbidden_len = max(
+            (len(w) for w in self._forbidden_words_lower), default=0
+        )
+
+        # 禁用词首字符集合：文本与它不相交时必然无命中，
+        # frozenset.isdisjoint 在 C 层一趟扫完，作为全文扫描前的廉价预筛
+        self._fw_first_chars = frozenset(
+            w[0] for w in self._forbidden_words_lower if w
+        )
+
+        # 禁用词全是无大小写字符（如纯中文）时，扫描前无需复制一份
+        # 小写文本——对万字文章每次检查省一次全文分配
+        self._forbidden_needs_lower = any(
+            w.lower() != w.upper() for w in self.forbidden_words
+        )
+
+        # 禁用词多时用 Aho-Corasick 自动机单趟扫描文本，
+        # 代替每个词一次的子串搜索
+        self._forbidden_automaton = None
+        if self.forbidden_words and ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for word, word_lower in zip(self.forbidden_words, self._forbidden_words_lower):
+                automaton.add_word(word_lower, word)
+            automaton.make_automaton()
+            self._forbidden_automaton = automaton
+
+        if self.forbidden_words:
+            joined = ', '.join(self.forbidden_words)
+            self._title_forbidden_hint = f"\n   - 标题中不得包含以下词汇: {joined}"
+            self._article_forbidden_hint = f"\n   - 文章中不得包含以下词汇: {joined}"
+        else:
+            self._title_forbidden_hint = ""
+            self._article_forbidden_hint = ""
+
+    def close(self):
+        """关闭 HTTP 会话和线程池，释放资源"""
+        try:
+            self.session.close()
+        except Exception as e:
+            self.logger.warning(f"关闭 HTTP 会话失败: {e}")
+        self._executor.shutdown(wait=False)
+
+    def _cached_chat(
+        self,
+        messages: List[Dict],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool = False,
+        stream: bool = False
+    ) -> str:
+        """
+        调用 chat.completions，可选地先查本地缓存
+
+        temperature 为 0（确定性输出）或调用方显式要求时才使用缓存；
+        禁用词列表参与缓存键，过滤规则变化后自动失效。
+
+        stream 为 True 时增量消费响应，并在流式内容中一出现禁用词就
+        关闭连接提前终止——被拒绝的草稿不再为剩余 token 付费；
+        返回的部分内容包含禁用词，由调用方现有的检查触发重试。
+
+        Args:
+            messages: 对话消息列表
+            temperature: 采样温度
+            max_tokens: 最大 token 数
+            use_cache: 温度大于 0 时是否仍使用缓存
+            stream: 是否使用流式响应
+
+        Returns:
+            str: 去除首尾空白的响应内容
+        """
+        cacheable = use_cache or temperature == 0
+        key = None
+
+        if cacheable:
+            key = LLMCache.make_key({
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "forbidden_words": self.forbidden_words,
+            })
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                self.logger.info("命中本地 LLM 缓存")
+                return cached
+
+        if stream:
+            content, aborted = self._stream_chat(messages, temperature, max_tokens)
+            if cacheable and not aborted:
+                self._llm_cache.set(key, content)
+            return content
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        content = response.choices[0].message.content.strip()
+
+        if cacheable:
+            self._llm_cache.set(key, content)
+
+        return content
+
+    def _stream_chat(self, messages: List[Dict], temperature: float, max_tokens: int):
+        """
+        流式消费 chat.completions，禁用词命中时提前终止
+
+        用一个长度为最长禁用词减一的滚动窗口拼接增量，跨 chunk 边界的
+        禁用词也能被捕获。
+
+        Args:
+            messages: 对话消息列表
+            temperature: 采样温度
+            max_tokens: 最大 token 数
+
+        Returns:
+            tuple: (内容, 是否提前终止)
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+
+        parts = []
+        tail = ""
+        aborted = False
+
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if not delta:
+                continue
+            parts.append(delta)
+
+            if self.forbidden_words:
+                window = tail + (delta.lower() if self._forbidden_needs_lower else delta)
+                hit = self._find_forbidden(window)
+                if hit is not None:
+                    self.logger.warning("流式响应中检测到禁用词，提前终止: %s", hit)
+                    response.close()
+                    aborted = True
+                    break
+                tail = window[-(self._max_forbidden_len - 1):] if self._max_forbidden_len > 1 else ""
+
+        return ''.join(parts).strip(), aborted
+
     def _check_forbidden_words(self, text: str) -> bool:
         """
         检查文本中是否包含禁用词
@@ -67,14 +718,39 @@ class ArticleGenerator:
         """
         if not self.forbidden_words:
             return False
-
-        text_lower = text.lower()
-        for word in self.forbidden_words:
-            if word.lower() in text_lower:
-                self.logger.warning(f"检测到禁用词: {word}")
-                return True
+        word = self._find_forbidden(
+            text.lower() if self._forbidden_needs_lower else text
+        )
+        if word is not None:
+            self.logger.warning("检测到禁用词: %s", word)
+            return True
         return False
 
+    def _find_forbidden(self, text_lower: str) -> Optional[str]:
+        """
+        在已小写的文本中查找第一个禁用词
+
+        Args:
+            text_lower: 已转小写的文本
+
+        Returns:
+            Optional[str]: 命中的禁用词（原始形式），未命中返回 None
+        """
+        # 预筛：文本不含任何禁用词首字符时直接判定无命中
+        if self._fw_first_chars.isdisjoint(text_lower):
+            return None
+
+        # Aho-Corasick：一趟扫描同时匹配所有禁用词
+        if self._forbidden_automaton is not None:
+            for _, word in self._forbidden_automaton.iter(text_lower):
+                return word
+            return None
+
+        for word, word_lower in zip(self.forbidden_words, self._forbidden_words_lower):
+            if word_lower in text_lower:
+                return word
+        return None
+
     def generate_titles(self, keyword: str, n: int = 3, max_retries: int = 3) -> List[str]:
         """
         根据关键词生成 n 个标题，并过滤禁用词
@@ -90,75 +766,48 @@ class ArticleGenerator:
         try:
             self.logger.info(f"正在为关键词 '{keyword}' 生成 {n} 个标题...")
 
-            # 构建禁用词提示
-            forbidden_hint = ""
-            if self.forbidden_words:
-                forbidden_hint = f"\n   - 标题中不得包含以下词汇: {', '.join(self.forbidden_words)}"
-
-            # 构建自然写作的禁用词列表（标题版）
-            unnatural_title_words = [
-                "深入探讨", "揭秘", "探索", "揭开", "完美", "深入剖析",
-                "深入分析", "深入了解", "剖析", "深入", "终极指南", "全面解析","带你了解"
-            ]
+            # 先查语义缓存：近似的关键词直接复用之前的标题
+            cached, query_emb = self._semantic_cache.lookup(f"titles_{n}", keyword)
+            if cached is not None:
+                return cached
 
-            # 构建提示词
-            prompt = f"""请根据以下关键词生成 {n} 个自然风格的中文文章标题。关键词需自然融入，不要堆叠。
+            # 一次多要几个标题，禁用词过滤后仍够数，避免整轮重试
+            ask_n = n + max(2, n // 2)
 
-关键词: {keyword}
-
-标题风格要求：
-1. 标题需自动匹配所属领域（科技、影视、数码、知识科普）的常见写作语气：
-   - 科技：理性、直接、信息清晰
-   - 数码：偏体验感、真实使用感受
-   - 影视：情绪化、更具画面感
-   - 科普：易懂、自然、亲切、不装腔
-2. 避免AI感很强的词汇: {', '.join(unnatural_title_words)}
-3. 不使用营销腔、官方腔的表达，例如：终极指南、深度解析、全面总结这类词汇
-4. 可以带些个人感受或真实体验感
-5. 标题长度控制在15-30字之间
-6. 适合SEO，关键词要自然融入句子里，但不要生硬堆砌关键词{forbidden_hint}
-7. 标题要兼容 Google + 百度SEO，但同时保持自然表达。
-标题示例（自然 vs 生硬）：
-❌ 不好: "深入探讨AI工具的完美应用"
-✅ 好: "2025年可免费使用的10多种AI工具"
-
-❌ 不好: "全面解析Python编程技巧"
-✅ 好: "【Python教程】《零基础入门学习Python》最新版"
-
-请直接返回 {n} 个标题，每行一个，不要添加编号或其他说明:"""
+            # 骨架已在类定义时构建，这里只替换变量部分
+            prompt = self._TITLE_PROMPT_TEMPLATE.format(
+                ask_n=ask_n,
+                keyword=keyword,
+                unnatural=_UNNATURAL_TITLE_WORDS,
+                forbidden_hint=self._title_forbidden_hint
+            )
 
             for attempt in range(max_retries):
                 # 调用 OpenAI API
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                content = self._cached_chat(
                     messages=[
-                        {"role": "system", "content": "你是一个擅长自然写作的内容创作者，能写出真实、有温度、不套路的标题。避免使用AI感强、营销腔的表达方式。"},
+                        {"role": "system", "content": self._SYS_TITLE},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.8,
-                    max_tokens=500
+                    max_tokens=500,
+                    stream=True
                 )
 
-                # 解析返回的标题
-                content = response.choices[0].message.content.strip()
-                titles = [line.strip() for line in content.split('\n') if line.strip()]
-
-                # 清理可能的编号
+                # 解析返回的标题（去除空行与行首编号），再过滤禁用词
                 cleaned_titles = []
-                for title in titles:
-                    # 去除可能的编号
-                    title = title.lstrip('0123456789.、 ')
-                    if title and not self._check_forbidden_words(title):
+                for title in _parse_lines(content):
+                    if not self._check_forbidden_words(title):
                         cleaned_titles.append(title)
-                    elif title:
-                        self.logger.warning(f"标题包含禁用词，已过滤: {title}")
+                    else:
+                        self.logger.warning("标题包含禁用词，已过滤: %s", title)
 
                 # 如果获得足够的标题，返回
                 if len(cleaned_titles) >= n:
                     cleaned_titles = cleaned_titles[:n]
-                    self.logger.info(f"成功生成 {len(cleaned_titles)} 个标题")
-                    for i, title in enumerate(cleaned_titles, 1):
-                        self.logger.info(f"  标题 {i}: {title}")
+                    self.logger.info("成功生成 %d 个标题", len(cleaned_titles))
+                    self.logger.debug("生成的标题: %s", " | ".join(cleaned_titles))
+                    self._semantic_cache.store(f"titles_{n}", query_emb, cleaned_titles)
                     return cleaned_titles
 
                 self.logger.warning(f"标题数量不足或包含禁用词，重试 ({attempt + 1}/{max_retries})")
@@ -185,49 +834,30 @@ class ArticleGenerator:
         try:
             self.logger.info(f"正在为标题 '{title}' 生成图片搜索关键词...")
 
-            prompt = f"""请根据以下文章标题，生成 {count} 个适合搜索图片的英文关键词。
-
-文章标题: {title}
-
-要求:
-1. 关键词要能准确反映文章的主题和内容
-2. 使用简洁的英文单词或短语（2-4个词）
-3. 适合在图片搜索引擎中使用
-4. 每个关键词应该独特，从不同角度描述主题
-5. 直接返回 {count} 个关键词，每行一个，不要添加编号或其他说明
-
-示例：
-如果标题是"AI工具推荐"，关键词可以是：
-artificial intelligence technology
-digital innovation workspace
-modern tech tools
+            # 先查语义缓存：近似的标题直接复用之前的图片关键词
+            cached, query_emb = self._semantic_cache.lookup(f"image_keywords_{count}", title)
+            if cached is not None:
+                return cached
 
-请生成关键词:"""
+            prompt = self._IMAGE_KEYWORDS_TEMPLATE.format(count=count, title=title)
 
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # 同一标题的图片关键词可以复用，允许缓存
+            content = self._cached_chat(
                 messages=[
-                    {"role": "system", "content": "你是一个专业的图片搜索专家，擅长将中文主题转化为准确的英文图片搜索关键词。"},
+                    {"role": "system", "content": self._SYS_IMAGE_KEYWORDS},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=200
+                max_tokens=200,
+                use_cache=True
             )
+            # 解析返回的关键词（去除空行与行首编号）
+            cleaned_keywords = _parse_lines(content)
 
-            content = response.choices[0].message.content.strip()
-            keywords = [line.strip() for line in content.split('\n') if line.strip()]
-
-            # 清理可能的编号
-            cleaned_keywords = []
-            for kw in keywords:
-                kw = kw.lstrip('0123456789.、 -')
-                if kw:
-                    cleaned_keywords.append(kw)
-
-            self.logger.info(f"生成了 {len(cleaned_keywords)} 个图片搜索关键词")
-            for i, kw in enumerate(cleaned_keywords[:count], 1):
-                self.logger.info(f"  关键词 {i}: {kw}")
+            self.logger.info("生成了 %d 个图片搜索关键词", len(cleaned_keywords))
+            self.logger.debug("图片搜索关键词: %s", " | ".join(cleaned_keywords[:count]))
 
+            self._semantic_cache.store(f"image_keywords_{count}", query_emb, cleaned_keywords[:count])
             return cleaned_keywords[:count]
 
         except Exception as e:
@@ -287,6 +917,47 @@ modern tech tools
             self.logger.error(f"DALL-E 生成图片失败: {e}")
             return None
 
+    def _generate_images_parallel(
+        self,
+        prompts: List[str],
+        model: str,
+        size: str,
+        quality: str,
+        style: str
+    ) -> List[str]:
+        """
+        并发调用 DALL-E 生成多张图片
+
+        单张图片生成需要 10-30 秒且相互独立，用线程池让网络等待
+        相互重叠；结果顺序与提示词顺序一致。
+
+        Args:
+            prompts: 图片提示词列表
+            model: 模型名称
+            size: 图片尺寸
+            quality: 图片质量
+            style: 图片风格
+
+        Returns:
+            List[str]: 生成成功的图片 URL 列表
+        """
+        if not prompts:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(len(prompts), 4)) as executor:
+            futures = [
+                executor.submit(
+                    self.generate_image_with_dalle,
+                    prompt,
+                    model=model,
+                    size=size,
+                    quality=quality,
+                    style=style
+                )
+                for prompt in prompts
+            ]
+            return [url for url in (f.result() for f in futures) if url]
+
     def generate_image_prompts(self, title: str, count: int = 3) -> List[str]:
         """
         根据文章标题生成 DALL-E 图片提示词
@@ -301,47 +972,29 @@ modern tech tools
         try:
             self.logger.info(f"正在为标题 '{title}' 生成 DALL-E 提示词...")
 
-            prompt = f"""请根据以下文章标题，生成 {count} 个适合 DALL-E 图片生成的英文提示词。
+            # 先查语义缓存：近似的标题直接复用之前的提示词
+            cached, query_emb = self._semantic_cache.lookup(f"image_prompts_{count}", title)
+            if cached is not None:
+                return cached
 
-文章标题: {title}
-
-要求:
-1. 提示词要详细描述期望的图片场景和风格
-2. 使用清晰、具体的英文描述（一句话，15-30个词）
-3. 包含主题、风格、构图等元素
-4. 适合生成专业、高质量的配图
-5. 直接返回 {count} 个提示词，每行一个，不要添加编号或其他说明
+            prompt = self._IMAGE_PROMPTS_TEMPLATE.format(count=count, title=title)
 
-示例：
-如果标题是"AI工具推荐"，提示词可以是：
-A modern workspace with AI technology, featuring holographic displays and futuristic interfaces, professional photography style, clean and minimalist
-Digital illustration of artificial intelligence neural network, vibrant colors, abstract tech pattern, high-tech atmosphere
-Realistic photo of a person using AI software on laptop, bright office environment, professional business setting
-
-请生成提示词:"""
-
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # 同一标题的提示词可以复用，允许缓存
+            content = self._cached_chat(
                 messages=[
-                    {"role": "system", "content": "你是一个专业的 DALL-E 提示词工程师，擅长将中文主题转化为高质量的英文图片生成提示词。"},
+                    {"role": "system", "content": self._SYS_IMAGE_PROMPTS},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
-                max_tokens=500
+                max_tokens=500,
+                use_cache=True
             )
-
-            content = response.choices[0].message.content.strip()
-            prompts = [line.strip() for line in content.split('\n') if line.strip()]
-
-            # 清理可能的编号
-            cleaned_prompts = []
-            for p in prompts:
-                p = p.lstrip('0123456789.、 -')
-                if p:
-                    cleaned_prompts.append(p)
+            # 解析返回的提示词（去除空行与行首编号）
+            cleaned_prompts = _parse_lines(content)
 
             self.logger.info(f"生成了 {len(cleaned_prompts)} 个 DALL-E 提示词")
 
+            self._semantic_cache.store(f"image_prompts_{count}", query_emb, cleaned_prompts[:count])
             return cleaned_prompts[:count]
 
         except Exception as e:
@@ -395,6 +1048,18 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.error(f"搜索图片失败: {e}，使用 Picsum Photos")
             return self._search_picsum(query, count)
 
+    def _picsum_fallback(self, fn, *, engine_name: str, count: int) -> List[str]:
+        """统一的搜索兜底：执行 fn，异常或无结果时回退 Picsum Photos"""
+        try:
+            images = fn()
+            if images:
+                self.logger.info("从 %s 获取了 %d 张图片", engine_name, len(images))
+                return images
+            self.logger.warning("%s 未返回图片，使用 Picsum Photos", engine_name)
+        except Exception as e:
+            self.logger.error(f"{engine_name} 搜索失败: {e}，使用 Picsum Photos")
+        return self._search_picsum("", count)
+
     def _search_unsplash(self, query: str, count: int) -> List[str]:
         """从 Unsplash 搜索图片"""
         api_key = os.getenv("UNSPLASH_ACCESS_KEY")
@@ -404,31 +1069,19 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 UNSPLASH_ACCESS_KEY，使用 Picsum Photos")
             return self._search_picsum(query, count)
 
-        try:
+        def fetch() -> List[str]:
             headers = {"Authorization": f"Client-ID {api_key}"}
-            response = requests.get(
-                f"https://api.unsplash.com/search/photos?query={query}&per_page={count}&orientation=landscape",
+            response = self.session.get(
+                "https://api.unsplash.com/search/photos",
+                params={"query": query, "per_page": count, "orientation": "landscape"},
                 headers=headers,
                 timeout=10
             )
+            response.raise_for_status()
+            data = _json_loads(response)
+            return [photo["urls"]["regular"] for photo in data.get("results", [])[:count]]
 
-            if response.status_code == 200:
-                data = response.json()
-                images = [photo["urls"]["regular"] for photo in data.get("results", [])[:count]]
-
-                if images:
-                    self.logger.info(f"从 Unsplash 获取了 {len(images)} 张图片")
-                    return images
-                else:
-                    self.logger.warning("Unsplash 未返回图片，使用 Picsum Photos")
-                    return self._search_picsum(query, count)
-            else:
-                self.logger.warning(f"Unsplash API 返回错误: {response.status_code}，使用 Picsum Photos")
-                return self._search_picsum(query, count)
-
-        except Exception as e:
-            self.logger.error(f"Unsplash 搜索失败: {e}，使用 Picsum Photos")
-            return self._search_picsum(query, count)
+        return self._picsum_fallback(fetch, engine_name="Unsplash", count=count)
 
     def _search_pexels(self, query: str, count: int) -> List[str]:
         """从 Pexels 搜索图片（需要 API key）"""
@@ -437,31 +1090,19 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 PEXELS_API_KEY，使用 Picsum Photos")
             return self._search_picsum(query, count)
 
-        try:
+        def fetch() -> List[str]:
             headers = {"Authorization": api_key}
-            response = requests.get(
-                f"https://api.pexels.com/v1/search?query={query}&per_page={count}",
+            response = self.session.get(
+                "https://api.pexels.com/v1/search",
+                params={"query": query, "per_page": count},
                 headers=headers,
                 timeout=10
             )
+            response.raise_for_status()
+            data = _json_loads(response)
+            return [photo["src"]["large"] for photo in data.get("photos", [])[:count]]
 
-            if response.status_code == 200:
-                data = response.json()
-                images = [photo["src"]["large"] for photo in data.get("photos", [])[:count]]
-
-                if images:
-                    self.logger.info(f"从 Pexels 获取了 {len(images)} 张图片")
-                    return images
-                else:
-                    self.logger.warning("Pexels 未返回图片，使用 Picsum Photos")
-                    return self._search_picsum(query, count)
-            else:
-                self.logger.warning(f"Pexels API 返回错误: {response.status_code}，使用 Picsum Photos")
-                return self._search_picsum(query, count)
-
-        except Exception as e:
-            self.logger.error(f"Pexels 搜索失败: {e}，使用 Picsum Photos")
-            return self._search_picsum(query, count)
+        return self._picsum_fallback(fetch, engine_name="Pexels", count=count)
 
     def _search_pixabay(self, query: str, count: int) -> List[str]:
         """从 Pixabay 搜索图片（需要 API key）"""
@@ -470,53 +1111,30 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 PIXABAY_API_KEY，使用 Picsum Photos")
             return self._search_picsum(query, count)
 
-        try:
-            response = requests.get(
-                f"https://pixabay.com/api/?key={api_key}&q={query}&per_page={count}&image_type=photo",
+        def fetch() -> List[str]:
+            response = self.session.get(
+                "https://pixabay.com/api/",
+                params={"key": api_key, "q": query, "per_page": count, "image_type": "photo"},
                 timeout=10
             )
+            response.raise_for_status()
+            data = _json_loads(response)
+            return [hit["largeImageURL"] for hit in data.get("hits", [])[:count]]
 
-            if response.status_code == 200:
-                data = response.json()
-                images = [hit["largeImageURL"] for hit in data.get("hits", [])[:count]]
-
-                if images:
-                    self.logger.info(f"从 Pixabay 获取了 {len(images)} 张图片")
-                    return images
-                else:
-                    self.logger.warning("Pixabay 未返回图片，使用 Picsum Photos")
-                    return self._search_picsum(query, count)
-            else:
-                self.logger.warning(f"Pixabay API 返回错误: {response.status_code}，使用 Picsum Photos")
-                return self._search_picsum(query, count)
-
-        except Exception as e:
-            self.logger.error(f"Pixabay 搜索失败: {e}，使用 Picsum Photos")
-            return self._search_picsum(query, count)
+        return self._picsum_fallback(fetch, engine_name="Pixabay", count=count)
 
     def _search_picsum(self, query: str, count: int) -> List[str]:
         """
         使用 Picsum Photos 作为备用图片源
         这是一个可靠的免费图片占位符服务，图片可以正常显示
         """
-        images = []
-        # 使用不同的图片 ID 来获取不同的图片
+        # 一次性无重复抽取图片 ID (1-1000)
         # Picsum 提供 1000+ 张高质量图片
-        import random
-        used_ids = set()
-
-        for i in range(count):
-            # 随机选择一个图片 ID (1-1000)
-            img_id = random.randint(1, 1000)
-            while img_id in used_ids:
-                img_id = random.randint(1, 1000)
-            used_ids.add(img_id)
-
-            # Picsum Photos URL 格式: https://picsum.photos/id/{id}/800/600
-            url = f"https://picsum.photos/id/{img_id}/800/600"
-            images.append(url)
+        # Picsum Photos URL 格式: https://picsum.photos/id/{id}/800/600
+        ids = random.sample(range(1, 1001), min(count, 1000))
+        images = [f"https://picsum.photos/id/{img_id}/800/600" for img_id in ids]
 
-        self.logger.info(f"从 Picsum Photos 获取了 {len(images)} 张图片")
+        self.logger.info("从 Picsum Photos 获取了 %d 张图片", len(images))
         return images
 
     def _search_unsplash_smart(self, keywords: List[str], count: int) -> List[str]:
@@ -526,31 +1144,33 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 UNSPLASH_ACCESS_KEY，使用 Picsum Photos")
             return self._search_picsum("", count)
 
-        images = []
-        for keyword in keywords[:count]:
+        def fetch(keyword: str) -> Optional[str]:
             try:
                 headers = {"Authorization": f"Client-ID {api_key}"}
-                response = requests.get(
-                    f"https://api.unsplash.com/search/photos?query={keyword}&per_page=1&orientation=landscape",
+                response = self.session.get(
+                    "https://api.unsplash.com/search/photos",
+                    params={"query": keyword, "per_page": 1, "orientation": "landscape"},
                     headers=headers,
                     timeout=10
                 )
 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _json_loads(response)
                     if data.get("results"):
-                        images.append(data["results"][0]["urls"]["regular"])
-                        self.logger.info(f"从 Unsplash 找到图片: {keyword}")
+                        self.logger.debug("从 Unsplash 找到图片: %s", keyword)
+                        return data["results"][0]["urls"]["regular"]
 
             except Exception as e:
                 self.logger.error(f"Unsplash 搜索 '{keyword}' 失败: {e}")
+            return None
 
-        if not images:
-            self.logger.warning("Unsplash 未返回图片，使用 Picsum Photos")
-            return self._search_picsum("", count)
+        def run() -> List[str]:
+            # 每个关键词的搜索相互独立，并发请求并保持顺序
+            queries = keywords[:count]
+            with ThreadPoolExecutor(max_workers=min(len(queries), 4)) as executor:
+                return [url for url in executor.map(fetch, queries) if url]
 
-        self.logger.info(f"从 Unsplash 获取了 {len(images)} 张图片")
-        return images
+        return self._picsum_fallback(run, engine_name="Unsplash", count=count)
 
     def _search_pexels_smart(self, keywords: List[str], count: int) -> List[str]:
         """使用智能关键词从 Pexels 搜索图片"""
@@ -559,31 +1179,33 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 PEXELS_API_KEY，使用 Picsum Photos")
             return self._search_picsum("", count)
 
-        images = []
-        for keyword in keywords[:count]:
+        def fetch(keyword: str) -> Optional[str]:
             try:
                 headers = {"Authorization": api_key}
-                response = requests.get(
-                    f"https://api.pexels.com/v1/search?query={keyword}&per_page=1",
+                response = self.session.get(
+                    "https://api.pexels.com/v1/search",
+                    params={"query": keyword, "per_page": 1},
                     headers=headers,
                     timeout=10
                 )
 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _json_loads(response)
                     if data.get("photos"):
-                        images.append(data["photos"][0]["src"]["large"])
-                        self.logger.info(f"从 Pexels 找到图片: {keyword}")
+                        self.logger.debug("从 Pexels 找到图片: %s", keyword)
+                        return data["photos"][0]["src"]["large"]
 
             except Exception as e:
                 self.logger.error(f"Pexels 搜索 '{keyword}' 失败: {e}")
+            return None
 
-        if not images:
-            self.logger.warning("Pexels 未返回图片，使用 Picsum Photos")
-            return self._search_picsum("", count)
+        def run() -> List[str]:
+            # 每个关键词的搜索相互独立，并发请求并保持顺序
+            queries = keywords[:count]
+            with ThreadPoolExecutor(max_workers=min(len(queries), 4)) as executor:
+                return [url for url in executor.map(fetch, queries) if url]
 
-        self.logger.info(f"从 Pexels 获取了 {len(images)} 张图片")
-        return images
+        return self._picsum_fallback(run, engine_name="Pexels", count=count)
 
     def _search_pixabay_smart(self, keywords: List[str], count: int) -> List[str]:
         """使用智能关键词从 Pixabay 搜索图片"""
@@ -592,29 +1214,154 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("未设置 PIXABAY_API_KEY，使用 Picsum Photos")
             return self._search_picsum("", count)
 
-        images = []
-        for keyword in keywords[:count]:
+        def fetch(keyword: str) -> Optional[str]:
             try:
-                response = requests.get(
-                    f"https://pixabay.com/api/?key={api_key}&q={keyword}&per_page=1&image_type=photo",
+                response = self.session.get(
+                    "https://pixabay.com/api/",
+                    params={"key": api_key, "q": keyword, "per_page": 1, "image_type": "photo"},
                     timeout=10
                 )
 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _json_loads(response)
                     if data.get("hits"):
-                        images.append(data["hits"][0]["largeImageURL"])
-                        self.logger.info(f"从 Pixabay 找到图片: {keyword}")
+                        self.logger.debug("从 Pixabay 找到图片: %s", keyword)
+                        return data["hits"][0]["largeImageURL"]
 
             except Exception as e:
                 self.logger.error(f"Pixabay 搜索 '{keyword}' 失败: {e}")
+            return None
 
-        if not images:
-            self.logger.warning("Pixabay 未返回图片，使用 Picsum Photos")
-            return self._search_picsum("", count)
+        def run() -> List[str]:
+            # 每个关键词的搜索相互独立，并发请求并保持顺序
+            queries = keywords[:count]
+            with ThreadPoolExecutor(max_workers=min(len(queries), 4)) as executor:
+                return [url for url in executor.map(fetch, queries) if url]
 
-        self.logger.info(f"从 Pixabay 获取了 {len(images)} 张图片")
-        return images
+        return self._picsum_fallback(run, engine_name="Pixabay", count=count)
+
+    def _validate_image_urls(self, urls: List[str]) -> List[str]:
+        """
+        并发 HEAD 校验图片 URL，剔除失效链接并用 Picsum 补齐
+
+        DALL-E 返回的 URL 约一小时后失效，提前校验避免发布后文章里
+        出现裂图。校验在后台图片任务里执行，与正文生成并行，不占
+        关键路径。
+
+        Args:
+            urls: 待校验的图片 URL 列表
+
+        Returns:
+            List[str]: 校验通过（必要时已补齐）的 URL 列表
+        """
+        if not urls:
+            return urls
+
+        def check(url: str) -> bool:
+            try:
+                # 重定向状态码也算有效（< 400），无需跟随
+                return self.session.head(url, timeout=3).status_code < 400
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(len(urls), 8)) as executor:
+            valid = [url for url, ok in zip(urls, executor.map(check, urls)) if ok]
+
+        dropped = len(urls) - len(valid)
+        if dropped:
+            self.logger.warning("有 %d 个图片 URL 校验失败，使用 Picsum Photos 补齐", dropped)
+            valid.extend(self._search_picsum("", dropped))
+        return valid
+
+    def _acquire_images(
+        self,
+        title: str,
+        image_count: int,
+        image_mode: str,
+        image_search_engine: str,
+        image_generate_model: str,
+        image_generate_size: str,
+        image_generate_quality: str,
+        image_generate_style: str
+    ) -> List[str]:
+        """
+        根据图片模式获取图片 URL（search / generate / mixed）
+
+        Args:
+            title: 文章标题
+            image_count: 图片数量
+            image_mode: 图片模式
+            image_search_engine: 图片搜索引擎
+            image_generate_model: DALL-E 模型
+            image_generate_size: 生成图片尺寸
+            image_generate_quality: 生成图片质量
+            image_generate_style: 生成图片风格
+
+        Returns:
+            List[str]: 图片 URL 列表
+        """
+        cache_key = LLMCache.make_key({
+            'title': title,
+            'count': image_count,
+            'mode': image_mode,
+            'engine': image_search_engine,
+            'model': image_generate_model,
+            'size': image_generate_size,
+            'quality': image_generate_quality,
+            'style': image_generate_style,
+        })
+        # generate/mixed 模式含会过期的 DALL-E URL，用短过期时间
+        ttl = ImageURLCache.SEARCH_TTL if image_mode == "search" else ImageURLCache.GENERATE_TTL
+        cached_urls = self._image_cache.get(cache_key, ttl)
+        if cached_urls:
+            self.logger.info(f"命中图片缓存，复用 {len(cached_urls)} 张图片")
+            return cached_urls
+
+        image_urls = []
+
+        if image_mode == "search":
+            # 模式1: 搜索互联网图片（使用智能关键词）
+            self.logger.info("使用搜索模式获取图片")
+            image_urls = self.search_images(title, image_count, image_search_engine, use_smart_keywords=True)
+
+        elif image_mode == "generate":
+            # 模式2: 使用 DALL-E 并发生成图片
+            self.logger.info("使用 DALL-E 生成图片")
+            prompts = self.generate_image_prompts(title, image_count)
+            image_urls.extend(self._generate_images_parallel(
+                prompts,
+                model=image_generate_model,
+                size=image_generate_size,
+                quality=image_generate_quality,
+                style=image_generate_style
+            ))
+
+        elif image_mode == "mixed":
+            # 模式3: 混合模式（部分搜索，部分生成）
+            self.logger.info("使用混合模式获取图片")
+            search_count = image_count // 2
+            generate_count = image_count - search_count
+
+            # 先搜索一部分
+            if search_count > 0:
+                search_urls = self.search_images(title, search_count, image_search_engine, use_smart_keywords=True)
+                image_urls.extend(search_urls)
+
+            # 再并发生成一部分
+            if generate_count > 0:
+                prompts = self.generate_image_prompts(title, generate_count)
+                image_urls.extend(self._generate_images_parallel(
+                    prompts,
+                    model=image_generate_model,
+                    size=image_generate_size,
+                    quality=image_generate_quality,
+                    style=image_generate_style
+                ))
+
+        if image_urls:
+            self._image_cache.set(cache_key, image_urls)
+
+        return image_urls
 
     def generate_article(
         self,
@@ -656,53 +1403,23 @@ Realistic photo of a person using AI software on laptop, bright office environme
         try:
             self.logger.info(f"正在生成文章: {title}")
 
-            # 根据图片模式获取图片
-            image_urls = []
+            # 图片获取与正文生成相互独立，提交到常驻线程池后台执行，
+            # 正文生成期间并行进行，最后替换占位符前再取结果
+            image_future = None
             if fetch_real_images and image_count > 0:
-                if image_mode == "search":
-                    # 模式1: 搜索互联网图片（使用智能关键词）
-                    self.logger.info("使用搜索模式获取图片")
-                    image_urls = self.search_images(title, image_count, image_search_engine, use_smart_keywords=True)
-
-                elif image_mode == "generate":
-                    # 模式2: 使用 DALL-E 生成图片
-                    self.logger.info("使用 DALL-E 生成图片")
-                    prompts = self.generate_image_prompts(title, image_count)
-                    for prompt in prompts:
-                        img_url = self.generate_image_with_dalle(
-                            prompt,
-                            model=image_generate_model,
-                            size=image_generate_size,
-                            quality=image_generate_quality,
-                            style=image_generate_style
-                        )
-                        if img_url:
-                            image_urls.append(img_url)
-
-                elif image_mode == "mixed":
-                    # 模式3: 混合模式（部分搜索，部分生成）
-                    self.logger.info("使用混合模式获取图片")
-                    search_count = image_count // 2
-                    generate_count = image_count - search_count
-
-                    # 先搜索一部分
-                    if search_count > 0:
-                        search_urls = self.search_images(title, search_count, image_search_engine, use_smart_keywords=True)
-                        image_urls.extend(search_urls)
-
-                    # 再生成一部分
-                    if generate_count > 0:
-                        prompts = self.generate_image_prompts(title, generate_count)
-                        for prompt in prompts:
-                            img_url = self.generate_image_with_dalle(
-                                prompt,
-                                model=image_generate_model,
-                                size=image_generate_size,
-                                quality=image_generate_quality,
-                                style=image_generate_style
-                            )
-                            if img_url:
-                                image_urls.append(img_url)
+                # 获取后紧接着在同一后台任务里校验 URL，与正文生成并行
+                image_future = self._executor.submit(
+                    lambda: self._validate_image_urls(self._acquire_images(
+                        title,
+                        image_count,
+                        image_mode,
+                        image_search_engine,
+                        image_generate_model,
+                        image_generate_size,
+                        image_generate_quality,
+                        image_generate_style
+                    ))
+                )
 
             for attempt in range(max_retries):
                 # 构建提示词
@@ -714,22 +1431,16 @@ Realistic photo of a person using AI software on laptop, bright office environme
                 )
 
                 # 调用 OpenAI API
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                article_content = self._cached_chat(
                     messages=[
-                        {
-                            "role": "system",
-                            "content": "你是一个擅长自然写作的内容创作者，能写出真实、有温度、不套路的文章。你的文章应该像真人在分享经验和见解，语气轻松自然，避免使用AI感强、营销腔、官方腔的表达方式。文章使用HTML格式排版。"
-                        },
+                        {"role": "system", "content": self._SYS_ARTICLE},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.7,
-                    max_tokens=4000
+                    max_tokens=4000,
+                    stream=True
                 )
 
-                # 获取生成的文章
-                article_content = response.choices[0].message.content.strip()
-
                 # 清理可能的完整 HTML 文档结构
                 article_content = self._clean_html_structure(article_content)
 
@@ -738,9 +1449,11 @@ Realistic photo of a person using AI software on laptop, bright office environme
                     self.logger.warning(f"文章包含禁用词，重新生成 ({attempt + 1}/{max_retries})")
                     continue
 
-                # 替换图片占位符
-                if fetch_real_images and image_urls:
-                    article_content = self._replace_image_placeholders(article_content, image_urls)
+                # 替换图片占位符（此时取回后台图片任务的结果）
+                if image_future is not None:
+                    image_urls = image_future.result()
+                    if image_urls:
+                        article_content = self._replace_image_placeholders(article_content, image_urls)
 
                 self.logger.info(f"文章生成成功，长度: {len(article_content)} 字符")
                 return article_content
@@ -768,28 +1481,16 @@ Realistic photo of a person using AI software on laptop, bright office environme
             self.logger.warning("检测到完整的 HTML 文档结构，正在清理...")
 
             # 尝试提取 body 标签内的内容
-            body_match = re.search(r'<body[^>]*>(.*)</body>', content, re.DOTALL | re.IGNORECASE)
+            body_match = _BODY_RE.search(content)
             if body_match:
                 content = body_match.group(1).strip()
                 self.logger.info("已提取 body 标签内的内容")
 
-            # 移除常见的文档结构标签
-            tags_to_remove = [
-                r'<!DOCTYPE[^>]*>',
-                r'<html[^>]*>',
-                r'</html>',
-                r'<head[^>]*>.*?</head>',
-                r'<body[^>]*>',
-                r'</body>',
-                r'<meta[^>]*>',
-                r'<title[^>]*>.*?</title>',
-            ]
-
-            for tag_pattern in tags_to_remove:
-                content = re.sub(tag_pattern, '', content, flags=re.DOTALL | re.IGNORECASE)
+            # 一趟替换移除所有常见的文档结构标签
+            content = _STRUCTURE_RE.sub('', content)
 
             # 清理多余的空行
-            content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+            content = _BLANK_LINES_RE.sub('\n\n', content)
             content = content.strip()
 
             self.logger.info("HTML 结构清理完成")
@@ -816,20 +1517,18 @@ Realistic photo of a person using AI software on laptop, bright office environme
         Returns:
             str: 替换后的内容
         """
-        # 查找所有图片占位符
-        pattern = r'<img\s+src="?\[IMAGE_PLACEHOLDER[^\]]*\]"?\s+alt="([^"]*)"'
-        matches = list(re.finditer(pattern, content))
+        # 单趟 sub 替换所有占位符，URL 用完后保留原占位符
+        urls = iter(image_urls)
 
-        # 替换占位符
-        for i, match in enumerate(matches):
-            if i < len(image_urls):
-                alt_text = match.group(1)
-                old_tag = match.group(0)
-                new_tag = f'<img src="{image_urls[i]}" alt="{alt_text}"'
-                content = content.replace(old_tag, new_tag, 1)
-                self.logger.info(f"替换图片占位符 {i+1}: {image_urls[i]}")
+        def repl(match):
+            try:
+                url = next(urls)
+            except StopIteration:
+                return match.group(0)
+            self.logger.debug("替换图片占位符: %s", url)
+            return f'<img src="{url}" alt="{match.group(1)}"'
 
-        return content
+        return _PLACEHOLDER_RE.sub(repl, content, count=len(image_urls))
 
     def _build_article_prompt(
         self,
@@ -850,72 +1549,22 @@ Realistic photo of a person using AI software on laptop, bright office environme
         Returns:
             str: 构建好的提示词
         """
-        # 构建禁用词提示
-        forbidden_hint = ""
-        if self.forbidden_words:
-            forbidden_hint = f"\n   - 文章中不得包含以下词汇: {', '.join(self.forbidden_words)}"
-
-        # 构建自然写作的禁用词列表
-        unnatural_words = [
-            "深入探讨", "揭秘", "探索", "揭开", "完美", "深入剖析",
-            "深入分析", "深入了解", "剖析", "深入", "引言", "总结",
-            "结语", "概括", "综上所述", "首先", "其次", "最后",
-            "从而", "因此可见", "在这篇文章中", "本文将", "让我们一起"
-        ]
-
-        prompt = f"""请根据以下标题撰写一篇自然、真实、有温度的中文文章。
-
-标题: {title}
-
-写作风格要求：
-1. 像一个真实的人在分享经验和见解，语气轻松自然
-2. 使用日常对话的语言，避免官方腔调和营销话术
-3. 可以用"我""你""咱们"等第一、第二人称，增加亲切感
-4. 适当使用口语化表达，让文章读起来更生动
-5. 避免使用这些AI感很强的词汇: {', '.join(unnatural_words)}
-
-内容要求：
-1. HTML标签格式排版:
-   - 段落使用 <p> 标签
-   - 小标题使用 <h2> 或 <h3> 标签（标题要自然、口语化）
-   - 重要内容可使用 <strong> 或 <em> 强调
-   - 列表使用 <ul> 和 <li> 标签
-   - 不要生成完整的 HTML 文档结构（如 <!DOCTYPE>, <html>, <head>, <body> 等标签）
-   - 只生成文章内容部分的 HTML
-
-2. 内容质量:
-   - 原创内容，有独特见解
-   - 逻辑自然流畅，不要生硬分段
-   - 目标字数约 {word_count} 字{forbidden_hint}
-
-3. 文章结构（但不要显式标注）:
-   - 开头自然切入主题，直接开始讲内容，不要写"在这篇文章中"之类的套话
-   - 中间部分自然展开，用 2-4 个小标题组织内容，小标题要口语化、有吸引力
-   - 结尾自然收束，可以是建议、展望或个人感受，不要用"总结""综上所述"
-
-4. 图片占位符:
-   - 在合适的位置插入 {image_count} 个图片占位符
-   - 格式: <img src="[IMAGE_PLACEHOLDER]" alt="相关描述">
-   - 图片描述要自然、具体，符合上下文
-
-5. 具体示例（如何自然表达）:
-   ❌ 不好: "首先，我们需要了解..."
-   ✅ 好: "说到这个，其实..."
-
-   ❌ 不好: "综上所述，我们可以得出结论..."
-   ✅ 好: "讲了这么多，你可能已经发现了..."
-
-   ❌ 不好: "本文将深入探讨AI工具的应用..."
-   ✅ 好: "最近用了不少AI工具，有些真的挺好用..."
-"""
+        # 骨架已在类定义时构建，这里只替换变量部分；
+        # 片段攒进列表一次 join，避免逐段 += 的重复拷贝
+        parts = [self._ARTICLE_PROMPT_TEMPLATE.format(
+            title=title,
+            unnatural=_UNNATURAL_WORDS,
+            word_count=word_count,
+            forbidden_hint=self._article_forbidden_hint,
+            image_count=image_count
+        )]
 
         # 如果提供了模板，添加到提示词中
         if template:
-            prompt += f"\n6. 可以参考以下模板结构（但要自然地表达，不要生硬套用）:\n{template}\n"
+            parts.append(f"\n6. 可以参考以下模板结构（但要自然地表达，不要生硬套用）:\n{template}\n")
 
-        prompt += "\n请开始创作（仅返回文章内容的HTML，不要包含 <!DOCTYPE>、<html>、<head>、<body> 等文档结构标签，也不要添加任何说明或注释）:"
-
-        return prompt
+        parts.append(self._ARTICLE_PROMPT_TAIL)
+        return ''.join(parts)
 
     def generate_seo_description(self, title: str, article: str, max_length: int = 160) -> str:
         """
@@ -932,31 +1581,20 @@ Realistic photo of a person using AI software on laptop, bright office environme
         try:
             self.logger.info(f"正在生成SEO描述...")
 
-            prompt = f"""请根据以下文章标题和内容，生成一段SEO友好的描述文本。
-
-标题: {title}
+            prompt = self._SEO_PROMPT_TEMPLATE.format(title=title, max_length=max_length)
 
-要求:
-1. 描述长度控制在 {max_length} 字符以内
-2. 包含关键信息和关键词
-3. 吸引用户点击
-4. 语言简洁明了
-5. 直接返回描述文本，不要包含其他说明
-
-请生成SEO描述:"""
-
-            response = self.client.chat.completions.create(
-                model=self.model,
+            # 流式消费：命中禁用词立即断流，不为剩余 token 付费
+            description = self._cached_chat(
                 messages=[
-                    {"role": "system", "content": "你是一个SEO专家，擅长撰写吸引人的meta描述。"},
+                    {"role": "system", "content": self._SYS_SEO},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.6,
-                max_tokens=200
+                max_tokens=200,
+                use_cache=True,
+                stream=True
             )
 
-            description = response.choices[0].message.content.strip()
-
             # 检查禁用词
             if self._check_forbidden_words(description):
                 self.logger.warning("SEO描述包含禁用词")
@@ -4,11 +4,90 @@ Publisher - WordPress 发布模块（支持 XML-RPC 和 REST API）
 负责将文章发布到 WordPress
 """
 
+import os
+import time
+import gzip
+import hashlib
+import random
 import logging
+import threading
+import unicodedata
 import requests
 import base64
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+# orjson 的 C 实现（反）序列化比标准库 json 快数倍；不可用时回退标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import json
+
+
+def _json_loads(response):
+    """解析 HTTP 响应的 JSON（orjson 可用时走 C 实现）"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _json_dumps(obj) -> bytes:
+    """序列化请求体为 JSON 字节串（orjson 可用时走 C 实现）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+class TermCache:
+    """分类/标签的跨进程本地缓存（每站点一个磁盘 JSON 文件）
+
+    分类体系和常用标签在发布任务之间几乎不变；落盘后，新一次
+    CLI 运行的第一篇文章就能省掉分类/标签发现请求，而不是只有
+    同进程内的后续文章受益。
+    """
+
+    # 分类/标签变动不频繁，缓存一天
+    TTL = 24 * 3600
+
+    def __init__(self, cache_dir: str = "./data/term_cache"):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, site: str) -> str:
+        """站点 URL 对应的缓存文件路径"""
+        name = hashlib.sha256(site.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, name + '.json')
+
+    def load(self, site: str) -> Optional[Dict]:
+        """读取站点的缓存条目，未命中或已过期返回 None"""
+        try:
+            with open(self._path(site), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if time.time() - entry.get('ts', 0) > self.TTL:
+            return None
+        return entry
+
+    def save(self, site: str, categories: Optional[list], tags: Dict[str, int]):
+        """写入站点的分类列表与标签映射"""
+        entry = {'ts': time.time(), 'categories': categories, 'tags': tags}
+        try:
+            with open(self._path(site), 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning(f"写入分类/标签缓存失败: {e}")
 
 
 class WordPressPublisherBase(ABC):
@@ -34,6 +113,16 @@ class WordPressPublisherBase(ABC):
         """测试连接"""
         pass
 
+    def close(self):
+        """关闭连接，释放资源（子类按需覆盖）"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     @abstractmethod
     def publish_post(
         self,
@@ -83,54 +172,145 @@ class WordPressRESTPublisher(WordPressPublisherBase):
         self.base_url = url.rstrip('/')
         self.api_url = f"{self.base_url}/wp-json/wp/v2"
 
-        # 设置认证头
-        credentials = f"{username}:{password}"
-        token = base64.b64encode(credentials.encode()).decode()
-        self.headers = {
-            'Authorization': f'Basic {token}',
-            'Content-Type': 'application/json'
-        }
+        # 持久会话：连接池 + HTTP keep-alive，
+        # 一次发布的多个请求复用同一条 TCP/TLS 连接。
+        # 认证头只在会话上设置一次，各请求不再逐个传 headers
+        credentials = f"{username}:{password}".encode('utf-8')
+        token = base64.standard_b64encode(credentials).decode('ascii')
+        self.session = requests.Session()
+        # 传输层对瞬时故障指数退避重试——失败的读请求在这里重试，
+        # 不必重跑整篇（已付费的）OpenAI 生成。POST 不在重试之列：
+        # WordPress 没有幂等键，重试建文章/标签可能产生重复
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retries
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Authorization'] = f'Basic {token}'
+        self.session.headers['Content-Type'] = 'application/json'
+
+        # batch/v1 端点是否可用（WordPress 5.6+），首次使用时探测并记住
+        self._batch_supported = None
+
+        # 服务端是否接受 gzip 请求体（部分托管主机会剥掉
+        # Content-Encoding），首次发布时探测并记住
+        self._gzip_supported = None
+
+        # 分类缓存：分类体系在一次发布任务内基本不变，
+        # 拉取一次整表后按名称查询全走内存
+        self._all_cats_cache = None
+        self._cats_cached_at = 0.0
+        self._cat_ttl = 3600
+        self._cat_cache: Dict[str, int] = {}
+        # 分类总数（X-WP-Total 响应头），随机选取时用 offset 只取一条
+        self._cat_total = None
+
+        # 标签缓存：重复发布时同名标签不再发起任何 HTTP 请求
+        self._tag_cache: Dict[str, int] = {}
+
+        # 磁盘缓存：分类/标签映射跨 CLI 运行复用（24 小时）
+        self._term_cache = TermCache()
+        entry = self._term_cache.load(self.base_url)
+        if entry:
+            if entry.get('categories'):
+                self._all_cats_cache = entry['categories']
+                self._cats_cached_at = time.time()
+                self._cat_cache = {cat['name']: cat['id'] for cat in entry['categories']}
+            self._tag_cache.update(entry.get('tags') or {})
 
         self.logger.info(f"WordPress REST API 客户端初始化: {self.base_url}")
 
+    def close(self):
+        """关闭 HTTP 会话，释放连接池"""
+        try:
+            self.session.close()
+        except Exception as e:
+            self.logger.warning(f"关闭 HTTP 会话失败: {e}")
+
     def test_connection(self) -> bool:
-        """测试 WordPress REST API 连接"""
+        """测试 WordPress REST API 连接
+
+        只请求站点发现文档（/wp-json/），不查用户表——比 /users/me
+        便宜一个数量级。需要确认凭据时调用 verify_auth()。
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/wp-json/",
+                timeout=5
+            )
+
+            if response.status_code < 400:
+                self.logger.info("REST API 连接成功")
+                return True
+
+            self.logger.error(f"REST API 连接失败：状态码 {response.status_code}")
+            return False
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"REST API 连接测试失败: {e}")
+            return False
+
+    def verify_auth(self) -> bool:
+        """验证认证凭据（请求当前用户信息）"""
         try:
-            # 测试获取当前用户信息
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/users/me",
-                headers=self.headers,
+                params={'_fields': 'id,name'},
                 timeout=10
             )
 
             if response.status_code == 200:
-                user_data = response.json()
-                self.logger.info(f"REST API 连接成功，用户: {user_data.get('name', 'Unknown')}")
+                user_data = _json_loads(response)
+                self.logger.info(f"REST API 认证成功，用户: {user_data.get('name', 'Unknown')}")
                 return True
             elif response.status_code == 401:
                 self.logger.error("REST API 认证失败：用户名或密码错误")
                 return False
             else:
-                self.logger.error(f"REST API 连接失败：状态码 {response.status_code}")
+                self.logger.error(f"REST API 认证失败：状态码 {response.status_code}")
                 return False
 
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"REST API 连接测试失败: {e}")
+            self.logger.error(f"REST API 认证测试失败: {e}")
             return False
 
-    def get_all_categories(self) -> list:
-        """获取所有分类"""
+    def _ensure_categories(self) -> list:
+        """
+        确保分类整表与名称索引已就位（TTL 内不发请求）
+
+        名称查询、随机选取和整表读取共用这一次抓取，
+        一批文章的分类解析只付一次 HTTP 成本。
+
+        Returns:
+            list: 分类列表（抓取失败返回空列表）
+        """
+        if (
+            self._all_cats_cache is not None
+            and time.time() - self._cats_cached_at < self._cat_ttl
+        ):
+            return self._all_cats_cache
+
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/categories",
-                headers=self.headers,
-                params={'per_page': 100},  # 获取最多100个分类
+                params={'per_page': 100, '_fields': 'id,name'},  # 获取最多100个分类，只取用到的字段
                 timeout=10
             )
 
             if response.status_code == 200:
-                categories = response.json()
+                categories = _json_loads(response)
                 self.logger.info(f"获取到 {len(categories)} 个分类")
+                self._all_cats_cache = categories
+                self._cats_cached_at = time.time()
+                self._cat_cache = {cat['name']: cat['id'] for cat in categories}
+                self._term_cache.save(self.base_url, categories, self._tag_cache)
                 return categories
             else:
                 self.logger.error(f"获取分类列表失败: {response.status_code}")
@@ -140,47 +320,101 @@ class WordPressRESTPublisher(WordPressPublisherBase):
             self.logger.error(f"获取分类列表失败: {e}")
             return []
 
+    def get_all_categories(self) -> list:
+        """获取所有分类（结果缓存一小时）"""
+        return self._ensure_categories()
+
+    def invalidate_categories(self):
+        """清除分类缓存（新增分类后调用）"""
+        self._all_cats_cache = None
+        self._cats_cached_at = 0.0
+        self._cat_cache = {}
+        self._term_cache.save(self.base_url, None, self._tag_cache)
+
     def get_random_category_id(self) -> Optional[int]:
         """随机选择一个分类 ID"""
         try:
-            import random
-            categories = self.get_all_categories()
-
-            if not categories:
+            # 整表缓存已在手时直接本地随机，零网络开销
+            if (
+                self._all_cats_cache is not None
+                and time.time() - self._cats_cached_at < self._cat_ttl
+            ):
+                return self._pick_random_cached()
+
+            # 冷启动：读 X-WP-Total 头得到总数，再按随机 offset 只取一条，
+            # 传输几百字节而不是整张分类表（exclude=1 跳过"未分类"）
+            if self._cat_total is None:
+                response = self.session.get(
+                    f"{self.api_url}/categories",
+                    params={'per_page': 1, '_fields': 'id,name', 'exclude': 1},
+                    timeout=10
+                )
+                total = response.headers.get('X-WP-Total')
+                if total is None:
+                    # 服务端不带总数头：回退整表路径（顺便填充缓存）
+                    self._ensure_categories()
+                    return self._pick_random_cached()
+                self._cat_total = int(total)
+
+            if self._cat_total <= 0:
                 self.logger.warning("没有可用的分类")
                 return None
 
-            # 过滤掉"未分类"（Uncategorized），通常 ID 为 1
-            valid_categories = [cat for cat in categories if cat['id'] != 1]
-
-            if not valid_categories:
-                # 如果只有"未分类"，就使用它
-                valid_categories = categories
+            response = self.session.get(
+                f"{self.api_url}/categories",
+                params={
+                    'per_page': 1,
+                    'offset': random.randint(0, self._cat_total - 1),
+                    '_fields': 'id,name',
+                    'exclude': 1
+                },
+                timeout=10
+            )
+            categories = _json_loads(response)
+            if categories:
+                cat = categories[0]
+                self.logger.info(f"随机选择分类: {cat['name']} (ID: {cat['id']})")
+                return cat['id']
 
-            random_cat = random.choice(valid_categories)
-            self.logger.info(f"随机选择分类: {random_cat['name']} (ID: {random_cat['id']})")
-            return random_cat['id']
+            self.logger.warning("没有可用的分类")
+            return None
 
         except Exception as e:
             self.logger.error(f"随机选择分类失败: {e}")
             return None
 
+    def _pick_random_cached(self) -> Optional[int]:
+        """从缓存的整表里随机选一个分类 ID"""
+        categories = self._all_cats_cache or []
+        if not categories:
+            self.logger.warning("没有可用的分类")
+            return None
+
+        # 过滤掉"未分类"（Uncategorized），通常 ID 为 1
+        valid_categories = [cat for cat in categories if cat['id'] != 1]
+
+        if not valid_categories:
+            # 如果只有"未分类"，就使用它
+            valid_categories = categories
+
+        random_cat = random.choice(valid_categories)
+        self.logger.info(f"随机选择分类: {random_cat['name']} (ID: {random_cat['id']})")
+        return random_cat['id']
+
     def get_category_id(self, category_name: str) -> Optional[int]:
-        """获取分类 ID"""
+        """获取分类 ID（优先走内存缓存）"""
         try:
-            response = requests.get(
-                f"{self.api_url}/categories",
-                headers=self.headers,
-                params={'search': category_name},
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                categories = response.json()
-                for cat in categories:
-                    if cat['name'] == category_name:
-                        self.logger.info(f"找到分类: {category_name} (ID: {cat['id']})")
-                        return cat['id']
+            cat_id = self._cat_cache.get(category_name)
+            if cat_id is not None:
+                return cat_id
+
+            # 未命中则确保整表缓存就位（search= 查询服务端无缓存，
+            # 且是子串匹配，按整表精确比对更快也更准）
+            self._ensure_categories()
+            cat_id = self._cat_cache.get(category_name)
+            if cat_id is not None:
+                self.logger.info(f"找到分类: {category_name} (ID: {cat_id})")
+                return cat_id
 
             self.logger.warning(f"未找到分类: {category_name}")
             return None
@@ -189,31 +423,132 @@ class WordPressRESTPublisher(WordPressPublisherBase):
             self.logger.error(f"获取分类 ID 失败: {e}")
             return None
 
+    def _batch(self, subrequests: list) -> Optional[list]:
+        """
+        通过 batch/v1 端点在一次 HTTP 往返内执行多个写操作
+
+        Args:
+            subrequests: 子请求列表（{'method', 'path', 'body'} 字典）
+
+        Returns:
+            Optional[list]: 按顺序排列的子响应列表；端点不可用或
+                请求失败返回 None
+        """
+        if self._batch_supported is False:
+            return None
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/wp-json/batch/v1",
+                data=_json_dumps({'requests': subrequests}),
+                timeout=30
+            )
+
+            if response.status_code == 404:
+                # 旧版 WordPress（< 5.6）没有 batch 端点，记住并走单请求路径
+                self.logger.info("batch/v1 端点不可用，回退单请求模式")
+                self._batch_supported = False
+                return None
+
+            if response.status_code == 207 or response.status_code == 200:
+                self._batch_supported = True
+                return _json_loads(response).get('responses', [])
+
+            self.logger.warning(f"batch/v1 请求失败: {response.status_code}")
+            return None
+
+        except Exception as e:
+            self.logger.error(f"batch/v1 请求失败: {e}")
+            return None
+
+    def _create_tags(self, tag_names: list) -> list:
+        """
+        批量创建标签并返回 ID 列表
+
+        优先用一次 batch/v1 调用创建全部标签（N 个往返变 1 个），
+        端点不可用时回退逐个 create_tag。
+
+        Args:
+            tag_names: 标签名称列表
+
+        Returns:
+            list: 创建/解析成功的标签 ID 列表
+        """
+        if not tag_names:
+            return []
+
+        # 已知标签直接取缓存，只有新标签才发请求
+        cached = {name: self._tag_cache[name] for name in tag_names if name in self._tag_cache}
+        new_names = [name for name in tag_names if name not in cached]
+        if not new_names:
+            return list(cached.values())
+
+        responses = self._batch([
+            {'method': 'POST', 'path': '/wp/v2/tags', 'body': {'name': name}}
+            for name in new_names
+        ])
+
+        if responses is None:
+            # batch 不可用：并发创建，墙钟时间从 N 个往返降到 1 个
+            with ThreadPoolExecutor(max_workers=min(8, len(new_names))) as executor:
+                created = [tid for tid in executor.map(self.create_tag, new_names) if tid]
+            self._term_cache.save(self.base_url, self._all_cats_cache, self._tag_cache)
+            return list(cached.values()) + created
+
+        tag_ids = list(cached.values())
+        for name, sub in zip(new_names, responses):
+            tag_id = None
+            if sub.get('status') == 201:
+                tag_id = sub.get('body', {}).get('id')
+                if tag_id:
+                    self._tag_cache[name] = tag_id
+            if tag_id is None:
+                # 子请求失败（如标签已存在），回退单请求路径解析
+                tag_id = self.create_tag(name)
+            if tag_id:
+                tag_ids.append(tag_id)
+
+        self._term_cache.save(self.base_url, self._all_cats_cache, self._tag_cache)
+        return tag_ids
+
     def create_tag(self, tag_name: str) -> Optional[int]:
-        """创建标签并返回 ID"""
+        """创建标签并返回 ID（已知标签直接走内存缓存）"""
         try:
-            response = requests.post(
+            tag_id = self._tag_cache.get(tag_name)
+            if tag_id is not None:
+                return tag_id
+
+            response = self.session.post(
                 f"{self.api_url}/tags",
-                headers=self.headers,
-                json={'name': tag_name},
+                data=_json_dumps({'name': tag_name}),
                 timeout=10
             )
 
             if response.status_code == 201:
-                tag_data = response.json()
-                return tag_data['id']
-            elif response.status_code == 400:
-                # 标签可能已存在，尝试获取
-                response = requests.get(
+                tag_id = _json_loads(response)['id']
+                self._tag_cache[tag_name] = tag_id
+                return tag_id
+            elif response.status_code in (400, 409):
+                # 标签已存在：term_exists 错误体里直接带着现有 ID，
+                # 无需再发一次查询请求
+                error = _json_loads(response)
+                tag_id = error.get('data', {}).get('term_id') if isinstance(error, dict) else None
+                if tag_id:
+                    self._tag_cache[tag_name] = tag_id
+                    return tag_id
+
+                # 极少数情况错误体不带 ID：用 search 查询后按名称精确
+                # 匹配兜底（slug 查询对多词/中文标签永远不命中，
+                # search 是子串匹配，所以仍需 name 相等判断过滤）
+                response = self.session.get(
                     f"{self.api_url}/tags",
-                    headers=self.headers,
-                    params={'search': tag_name},
+                    params={'search': tag_name, '_fields': 'id,name'},
                     timeout=10
                 )
                 if response.status_code == 200:
-                    tags = response.json()
-                    for tag in tags:
+                    for tag in _json_loads(response):
                         if tag['name'] == tag_name:
+                            self._tag_cache[tag_name] = tag['id']
                             return tag['id']
 
             return None
@@ -222,6 +557,69 @@ class WordPressRESTPublisher(WordPressPublisherBase):
             self.logger.error(f"创建标签失败: {e}")
             return None
 
+    def _probe_gzip_support(self, url: str):
+        """用一次 OPTIONS 请求探测服务端是否接受 gzip 请求体
+
+        探测本身无副作用，结果记在实例上只查一次。拿不准时一律
+        按不支持处理——压缩省下的带宽不值得赌请求体被拒。
+        """
+        try:
+            response = self.session.options(url, timeout=5)
+            accept = response.headers.get('Accept-Encoding', '')
+            self._gzip_supported = 'gzip' in accept.lower()
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"gzip 支持探测失败: {e}")
+            self._gzip_supported = False
+
+        if not self._gzip_supported:
+            self.logger.info("服务端未声明接受 gzip 请求体，使用未压缩上传")
+
+    def _post_json(self, url: str, body: bytes, timeout: int = 30):
+        """
+        发送 JSON 请求体，超过 2KB 时尝试 gzip 压缩上传
+
+        是否压缩由一次 OPTIONS 探测决定；POST 不幂等（重发可能
+        重复建文），所以任何情况下都只发送一次。
+
+        Args:
+            url: 请求地址
+            body: 已序列化的 JSON 字节串
+            timeout: 超时秒数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        if len(body) > 2048:
+            if self._gzip_supported is None:
+                self._probe_gzip_support(url)
+            if self._gzip_supported:
+                return self.session.post(
+                    url,
+                    data=gzip.compress(body, compresslevel=6),
+                    headers={'Content-Encoding': 'gzip'},
+                    timeout=timeout
+                )
+
+        return self.session.post(url, data=body, timeout=timeout)
+
+    @staticmethod
+    def _normalize_tags(tags: Optional[list]) -> list:
+        """
+        规范化标签：NFKC 归一、去首尾空白、折叠连续空白、小写化，
+        并保序去重——变体拼写的重复标签不再各自触发一次 HTTP 请求
+
+        Args:
+            tags: 原始标签列表
+
+        Returns:
+            list: 规范化且去重后的标签列表
+        """
+        return list(dict.fromkeys(
+            ' '.join(unicodedata.normalize('NFKC', t).split()).lower()
+            for t in (tags or [])
+            if t and t.strip()
+        ))
+
     def publish_post(
         self,
         title: str,
@@ -235,6 +633,9 @@ class WordPressRESTPublisher(WordPressPublisherBase):
         try:
             self.logger.info(f"准备发布文章 (REST API): {title}")
 
+            # 标签先在本地规范化去重，再进入缓存/批量创建层
+            tags = self._normalize_tags(tags)
+
             # 构建文章数据
             post_data = {
                 'title': title,
@@ -262,26 +663,19 @@ class WordPressRESTPublisher(WordPressPublisherBase):
             if category_id:
                 post_data['categories'] = [category_id]
 
-            # 设置标签
+            # 设置标签（一次 batch 调用创建全部标签）
             if tags:
-                tag_ids = []
-                for tag_name in tags:
-                    tag_id = self.create_tag(tag_name)
-                    if tag_id:
-                        tag_ids.append(tag_id)
+                tag_ids = self._create_tags(tags)
                 if tag_ids:
                     post_data['tags'] = tag_ids
 
-            # 发布文章
-            response = requests.post(
-                f"{self.api_url}/posts",
-                headers=self.headers,
-                json=post_data,
-                timeout=30
-            )
+            # 发布文章（大请求体 gzip 压缩后上传，文章 HTML 可压缩 3-5 倍）
+            body = _json_dumps(post_data)
+            # _fields 同样作用于写操作的响应体，省去 _links/meta 等无用字段
+            response = self._post_json(f"{self.api_url}/posts?_fields=id,link,status", body)
 
             if response.status_code == 201:
-                post = response.json()
+                post = _json_loads(response)
                 post_id = str(post['id'])
                 status_text = "已发布" if post_data['status'] == "publish" else "已保存为草稿"
                 self.logger.info(f"文章 {status_text}: {title} (ID: {post_id})")
@@ -345,6 +739,10 @@ class WordPressXMLRPCPublisher(WordPressPublisherBase):
             self.logger.error(f"WordPress XML-RPC 客户端初始化失败: {e}")
             raise
 
+        # xmlrpc.client 的传输层复用单条 HTTP 连接且非线程安全，
+        # 多线程发布时必须串行化对 client 的调用
+        self._publish_lock = threading.Lock()
+
     def test_connection(self) -> bool:
         """测试 WordPress XML-RPC 连接"""
         try:
@@ -368,7 +766,6 @@ class WordPressXMLRPCPublisher(WordPressPublisherBase):
     def get_random_category(self) -> Optional[tuple]:
         """随机选择一个分类，返回 (name, id)"""
         try:
-            import random
             categories = self.get_all_categories()
 
             if not categories:
@@ -415,7 +812,24 @@ class WordPressXMLRPCPublisher(WordPressPublisherBase):
         tags: Optional[list] = None,
         excerpt: Optional[str] = None
     ) -> Optional[str]:
-        """发布文章到 WordPress（XML-RPC）"""
+        """发布文章到 WordPress（XML-RPC）
+
+        并发任务在这里排队：分类查询和 NewPost 共用同一个
+        XML-RPC 客户端连接，交错调用会在套接字上互相踩踏。
+        """
+        with self._publish_lock:
+            return self._publish_post_locked(title, content, category, status, tags, excerpt)
+
+    def _publish_post_locked(
+        self,
+        title: str,
+        content: str,
+        category: Optional[str],
+        status: Optional[str],
+        tags: Optional[list],
+        excerpt: Optional[str]
+    ) -> Optional[str]:
+        """publish_post 的实际实现（调用方需持有 _publish_lock）"""
         try:
             self.logger.info(f"准备发布文章 (XML-RPC): {title}")
 
@@ -463,12 +877,18 @@ class WordPressXMLRPCPublisher(WordPressPublisherBase):
             return str(post_id)
 
         except Exception as e:
-            self.logger.error(f"发布文章失败 (XML-RPC): {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
+            # logger.exception 由日志层惰性格式化堆栈，无处理器时不付分配成本
+            self.logger.exception("发布文章失败 (XML-RPC): %s", e)
             return None
 
 
+# api_method 到发布器类的分发表：强制指定方式时免去逐串比较
+_PUBLISHER_BACKENDS = {
+    'rest': WordPressRESTPublisher,
+    'xmlrpc': WordPressXMLRPCPublisher,
+}
+
+
 def create_publisher(config: Dict[str, Any]) -> Optional[WordPressPublisherBase]:
     """
     从配置创建 WordPress 发布器
@@ -493,45 +913,57 @@ def create_publisher(config: Dict[str, Any]) -> Optional[WordPressPublisherBase]
         category = config.get('category', '未分类')
         status = config.get('status', 'draft')
 
-        # 自动选择：优先 REST API，失败则尝试 XML-RPC
+        # 自动选择：两种探测并发进行，优先 REST API
         if api_method == 'auto':
-            logger.info("尝试使用 REST API 连接...")
-            try:
-                publisher = WordPressRESTPublisher(url, username, password, category, status)
-                if publisher.test_connection():
-                    logger.info("✓ 使用 REST API 方式发布")
-                    return publisher
-                else:
-                    logger.warning("REST API 连接失败，尝试 XML-RPC...")
-            except Exception as e:
-                logger.warning(f"REST API 初始化失败: {e}，尝试 XML-RPC...")
-
-            try:
-                publisher = WordPressXMLRPCPublisher(url, username, password, category, status)
-                if publisher.test_connection():
-                    logger.info("✓ 使用 XML-RPC 方式发布")
-                    return publisher
-                else:
-                    logger.error("XML-RPC 连接也失败")
-                    return None
-            except Exception as e:
-                logger.error(f"XML-RPC 初始化失败: {e}")
+            def probe_rest() -> Optional[WordPressRESTPublisher]:
+                try:
+                    publisher = WordPressRESTPublisher(url, username, password, category, status)
+                    # 连通性探测不带凭据；认证失败（如未配置应用密码）
+                    # 时不能选 REST，交还 XML-RPC 尝试
+                    if publisher.test_connection() and publisher.verify_auth():
+                        return publisher
+                    publisher.close()
+                except Exception as e:
+                    logger.warning(f"REST API 初始化失败: {e}")
                 return None
 
-        # 强制使用 REST API
-        elif api_method == 'rest':
-            logger.info("使用 REST API 方式")
-            return WordPressRESTPublisher(url, username, password, category, status)
+            def probe_xmlrpc() -> Optional[WordPressXMLRPCPublisher]:
+                try:
+                    publisher = WordPressXMLRPCPublisher(url, username, password, category, status)
+                    if publisher.test_connection():
+                        return publisher
+                except Exception as e:
+                    logger.warning(f"XML-RPC 初始化失败: {e}")
+                return None
 
-        # 强制使用 XML-RPC
-        elif api_method == 'xmlrpc':
-            logger.info("使用 XML-RPC 方式")
-            return WordPressXMLRPCPublisher(url, username, password, category, status)
+            logger.info("并发探测 REST API 与 XML-RPC 连接...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                rest_future = executor.submit(probe_rest)
+                xmlrpc_future = executor.submit(probe_xmlrpc)
 
-        else:
-            logger.error(f"不支持的 API 方式: {api_method}")
+                rest_publisher = rest_future.result()
+                if rest_publisher:
+                    logger.info("✓ 使用 REST API 方式发布")
+                    return rest_publisher
+
+                logger.warning("REST API 连接失败，尝试 XML-RPC...")
+                xmlrpc_publisher = xmlrpc_future.result()
+                if xmlrpc_publisher:
+                    logger.info("✓ 使用 XML-RPC 方式发布")
+                    return xmlrpc_publisher
+
+            logger.error("XML-RPC 连接也失败")
             return None
 
+        # 强制指定方式：查分发表直接实例化
+        backend = _PUBLISHER_BACKENDS.get(api_method)
+        if backend is not None:
+            logger.info(f"使用 {api_method.upper()} 方式")
+            return backend(url, username, password, category, status)
+
+        logger.error(f"不支持的 API 方式: {api_method}")
+        return None
+
     except Exception as e:
         logger.error(f"创建 WordPress 发布器失败: {e}")
         return None
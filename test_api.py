@@ -46,19 +46,20 @@ if api_key:
 
         client = OpenAI(**client_kwargs)
 
+        # 先做离线格式检查，明显错误的 key 不必发请求
+        if not api_key.startswith('sk-'):
+            print("⚠️  API Key 格式异常（通常以 sk- 开头）")
+
         print("\n正在测试 API 连接...")
 
-        # 发送测试请求
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "user", "content": "Hello"}
-            ],
-            max_tokens=10
-        )
+        # 列出模型即可验证凭据：不产生 token 计费，也比一次补全快得多
+        model = next(iter(client.models.list()), None)
 
-        print("✓ API 连接成功！")
-        print(f"  响应内容: {response.choices[0].message.content}")
+        if model:
+            print("✓ API 连接成功！")
+            print(f"  可用模型示例: {model.id}")
+        else:
+            print("⚠️  连接成功但未返回任何模型")
 
     except Exception as e:
         print(f"❌ API 连接失败: {e}")
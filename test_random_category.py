@@ -7,6 +7,12 @@ import yaml
 from pathlib import Path
 from publisher import create_publisher
 
+# 优先使用 LibYAML 的 C 实现加载器（约快一个数量级），不可用时回退纯 Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def main():
     print("=" * 70)
@@ -20,7 +26,7 @@ def main():
         return 1
 
     with open(config_file, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     wp_config = config.get('wordpress', {})
 
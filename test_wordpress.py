@@ -4,26 +4,239 @@ WordPress 连接测试脚本（支持 REST API 和 XML-RPC）
 用于诊断 WordPress 连接问题
 """
 
+import io
 import sys
+import json
+import argparse
+import socket
 import requests
-import yaml
 import base64
+import functools
+import threading
+import xml.etree.ElementTree as ElementTree
+from xml.sax.saxutils import escape
 from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 
+# HTTP/2 客户端（可选）：多次探测可在一条 TLS 连接上多路复用
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-def test_rest_api_availability(base_url):
+# 更快的 JSON 解析（可选）：orjson 为 C 实现，直接处理 bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _json_loads(response):
+    """解析 HTTP 响应的 JSON 内容（优先 orjson）"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _json_dumps(obj) -> bytes:
+    """序列化请求体（优先 orjson，返回 UTF-8 字节串）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+class _ThreadLocalStdout:
+    """按线程路由 print 输出
+
+    并发探测各自写入独立缓冲区，主线程照常写终端，
+    避免并行任务的输出交错成一团。
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._local = threading.local()
+
+    def bind(self, buf):
+        self._local.buf = buf
+
+    def unbind(self):
+        self._local.buf = None
+
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        (buf if buf is not None else self._target).write(text)
+
+    def flush(self):
+        buf = getattr(self._local, 'buf', None)
+        (buf if buf is not None else self._target).flush()
+
+
+def _submit_buffered(executor, router, fn, *args):
+    """把探测任务提交到线程池，任务的输出写入各自的缓冲区
+
+    Returns:
+        Future，结果为 (探测返回值, 缓冲的输出文本)
+    """
+    def run():
+        buf = io.StringIO()
+        router.bind(buf)
+        try:
+            return fn(*args), buf.getvalue()
+        finally:
+            router.unbind()
+    return executor.submit(run)
+
+
+def normalize_site_url(url):
+    """把配置里的站点地址规整为 (base_url, xmlrpc_url)
+
+    Args:
+        url: 配置的站点地址，可以带也可以不带协议或 /xmlrpc.php 后缀
+
+    Returns:
+        (base_url, xmlrpc_url) 元组
+    """
+    if url.endswith('/xmlrpc.php'):
+        url = url[:-len('/xmlrpc.php')]
+
+    parts = urlparse(url if '//' in url else '//' + url, scheme='https')
+    base_url = f"{parts.scheme}://{parts.netloc}{parts.path}".rstrip('/')
+    return base_url, f"{base_url}/xmlrpc.php"
+
+
+@functools.cache
+def load_wp_config(path="config.yaml"):
+    """读取并解析 config.yaml 的 wordpress 配置
+
+    YAML 解析是这段启动路径里最贵的一步；按路径缓存后，
+    本脚本被当作库反复调用时同一份配置只解析一次。
+
+    Args:
+        path: 配置文件路径
+
+    Returns:
+        带 enabled/base_url/xmlrpc_url/username/password/api_method
+        字段的 SimpleNamespace；文件不存在返回 None
+    """
+    config_file = Path(path)
+    if not config_file.exists():
+        return None
+
+    # 延迟导入：yaml 的解析器依赖图不小，走到"缺配置"的错误
+    # 路径时完全不用付这笔导入开销。优先 LibYAML 的 C 加载器
+    import yaml
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=YamlLoader)
+
+    wp_config = config.get('wordpress', {}) or {}
+    base_url, xmlrpc_url = normalize_site_url(wp_config.get('url') or '')
+    return SimpleNamespace(
+        enabled=wp_config.get('enabled', False),
+        base_url=base_url,
+        xmlrpc_url=xmlrpc_url,
+        username=wp_config.get('username'),
+        password=wp_config.get('password'),
+        api_method=wp_config.get('api_method', 'auto'),
+    )
+
+
+def prime_dns(base_url):
+    """预热 DNS：主机固定且已知，启动时解析一次写入系统缓存
+
+    冷缓存下每次解析要 20-200 ms；提前做掉后，各探测建连时
+    直接命中缓存。解析失败不在这里报错，留给具体探测输出。
+    """
+    host = urlparse(base_url).hostname
+    if not host:
+        return
+    try:
+        socket.getaddrinfo(host, 443, proto=socket.IPPROTO_TCP)
+    except OSError:
+        pass
+
+
+def warm_connection(session, base_url):
+    """预热连接：提前完成 TCP+TLS 握手
+
+    第一条探测否则要独自背上建连成本（TLS 1.2 约 3 个往返），
+    把握手耗时误报成 API 延迟。预热后连接留在会话的连接池里，
+    后续探测全部命中热连接。连不上这里不报错，由具体探测诊断。
+    """
+    try:
+        session.head(f"{base_url}/", timeout=5)
+    except Exception:
+        pass
+
+
+def make_session():
+    """创建全局共享的 HTTP 会话
+
+    所有探测都打同一台主机，复用 keep-alive 连接可以省掉
+    每次请求的 TCP+TLS 握手；瞬时的 502/503/504 自动重试，
+    避免偶发抖动导致整轮诊断白跑。
+
+    Returns:
+        httpx.Client（支持 HTTP/2）或 requests.Session
+    """
+    # 装有 httpx 时启用 HTTP/2：站点经 nginx/Cloudflare 几乎都
+    # 协商 HTTP/2，多次探测共享一条连接的并发流
+    if httpx is not None:
+        # requests 默认跟随重定向而 httpx 不会；WordPress 常见
+        # /wp-json -> /wp-json/ 和 http -> https 的 301
+        return httpx.Client(
+            http2=True,
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# 连接诊断用的测试草稿（逐项与 Batch 路径共用）
+_TEST_POST_DATA = {
+    'title': '[测试] AutoPost 连接测试',
+    'content': '<p>这是一篇由 AutoPost 工具创建的测试文章。如果您看到这篇文章，说明连接成功。</p><p>您可以安全地删除此文章。</p>',
+    'status': 'draft'
+}
+
+
+def test_rest_api_availability(session, base_url):
     """测试 WordPress REST API 是否可用"""
     print(f"\n1. 测试 REST API 端点是否可访问...")
     api_url = f"{base_url}/wp-json/wp/v2"
     print(f"   URL: {api_url}")
 
     try:
-        response = requests.get(f"{base_url}/wp-json", timeout=10)
+        # 只取要展示的字段：根发现文档动辄上百 KB 的路由表
+        response = session.get(
+            f"{base_url}/wp-json",
+            params={'_fields': 'name,namespaces'},
+            timeout=10
+        )
 
         print(f"   状态码: {response.status_code}")
 
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response)
             print("   ✓ REST API 端点可访问")
             print(f"   站点名称: {data.get('name', 'Unknown')}")
             print(f"   API 命名空间: {data.get('namespaces', [])}")
@@ -43,32 +256,24 @@ def test_rest_api_availability(base_url):
         return False
 
 
-def test_rest_api_authentication(base_url, username, password):
-    """测试 REST API 认证"""
+def test_rest_api_authentication(session, base_url):
+    """测试 REST API 认证（认证头已挂在会话上）"""
     print(f"\n2. 测试 REST API 认证...")
 
     try:
         api_url = f"{base_url}/wp-json/wp/v2"
 
-        # 创建认证头
-        credentials = f"{username}:{password}"
-        token = base64.b64encode(credentials.encode()).decode()
-        headers = {
-            'Authorization': f'Basic {token}',
-            'Content-Type': 'application/json'
-        }
-
-        # 尝试获取当前用户信息
-        response = requests.get(
+        # 尝试获取当前用户信息（只取要展示的字段）
+        response = session.get(
             f"{api_url}/users/me",
-            headers=headers,
+            params={'_fields': 'id,name,roles'},
             timeout=10
         )
 
         print(f"   状态码: {response.status_code}")
 
         if response.status_code == 200:
-            user_data = response.json()
+            user_data = _json_loads(response)
             print("   ✓ REST API 认证成功")
             print(f"   用户ID: {user_data.get('id')}")
             print(f"   用户名: {user_data.get('name')}")
@@ -97,38 +302,25 @@ def test_rest_api_authentication(base_url, username, password):
         return False
 
 
-def test_rest_api_post_creation(base_url, username, password):
-    """测试 REST API 创建文章"""
+def test_rest_api_post_creation(session, base_url):
+    """测试 REST API 创建文章（认证头已挂在会话上）"""
     print(f"\n3. 测试 REST API 创建草稿...")
 
     try:
         api_url = f"{base_url}/wp-json/wp/v2"
 
-        credentials = f"{username}:{password}"
-        token = base64.b64encode(credentials.encode()).decode()
-        headers = {
-            'Authorization': f'Basic {token}',
-            'Content-Type': 'application/json'
-        }
-
-        # 创建测试文章
-        post_data = {
-            'title': '[测试] AutoPost 连接测试',
-            'content': '<p>这是一篇由 AutoPost 工具创建的测试文章。如果您看到这篇文章，说明连接成功。</p><p>您可以安全地删除此文章。</p>',
-            'status': 'draft'
-        }
-
-        response = requests.post(
+        # 创建测试文章（响应只取要展示的字段）
+        response = session.post(
             f"{api_url}/posts",
-            headers=headers,
-            json=post_data,
+            params={'_fields': 'id,title,link'},
+            data=_json_dumps(_TEST_POST_DATA),
             timeout=30
         )
 
         print(f"   状态码: {response.status_code}")
 
         if response.status_code == 201:
-            post = response.json()
+            post = _json_loads(response)
             print("   ✓ 成功创建测试文章（草稿）")
             print(f"   文章ID: {post.get('id')}")
             print(f"   标题: {post.get('title', {}).get('rendered')}")
@@ -145,33 +337,118 @@ def test_rest_api_post_creation(base_url, username, password):
         return False
 
 
-def test_xmlrpc_availability(url):
-    """测试 XML-RPC 是否可用"""
+def test_rest_api_batch(session, base_url):
+    """用 Batch API 一次往返跑完 REST 诊断链
+
+    WordPress 5.5+ 的 /wp-json/batch/v1 在服务端依次执行子请求，
+    认证检查和建草稿从多个往返缩成一个；batch 调用本身成功即
+    证明 REST 端点可达。任一环节异常时返回 None，让逐项探测
+    输出具体的失败原因和解决建议。
+
+    Returns:
+        全部通过返回 True；Batch 不可用或有子项失败返回 None
+    """
+    print(f"\n1. 测试 REST API（Batch 合并请求）...")
+    batch_url = f"{base_url}/wp-json/batch/v1"
+    print(f"   URL: {batch_url}")
+
+    try:
+        response = session.post(
+            batch_url,
+            data=_json_dumps({'requests': [
+                {'method': 'GET', 'path': '/wp/v2/users/me?_fields=id,name,roles'},
+                {'method': 'POST', 'path': '/wp/v2/posts?_fields=id,title,link',
+                 'body': _TEST_POST_DATA},
+            ]}),
+            timeout=30
+        )
+
+        print(f"   状态码: {response.status_code}")
+
+        if response.status_code == 404:
+            print("   ⚠️  站点不支持 Batch API（WordPress < 5.5），改为逐项测试")
+            return None
+        if response.status_code not in (200, 207):
+            print(f"   ⚠️  意外的状态码: {response.status_code}，改为逐项测试")
+            return None
+
+        responses = _json_loads(response).get('responses', [])
+        if len(responses) != 2:
+            return None
+
+        me, post = responses
+        if me.get('status') != 200 or post.get('status') != 201:
+            print("   ⚠️  Batch 子请求未全部成功，改为逐项测试")
+            return None
+
+        print("   ✓ REST API 端点可访问")
+
+        user_data = me.get('body', {})
+        print("\n2. 测试 REST API 认证...")
+        print("   ✓ REST API 认证成功")
+        print(f"   用户ID: {user_data.get('id')}")
+        print(f"   用户名: {user_data.get('name')}")
+        print(f"   角色: {user_data.get('roles', [])}")
+
+        post_body = post.get('body', {})
+        print("\n3. 测试 REST API 创建草稿...")
+        print("   ✓ 成功创建测试文章（草稿）")
+        print(f"   文章ID: {post_body.get('id')}")
+        print(f"   标题: {post_body.get('title', {}).get('rendered')}")
+        print(f"   预览链接: {post_body.get('link')}")
+        print("\n   注意：这是一篇测试文章，您可以在 WordPress 后台删除它")
+        return True
+
+    except Exception as e:
+        print(f"   ⚠️  Batch 请求失败: {e}，改为逐项测试")
+        return None
+
+
+def run_rest_tests(session, base_url):
+    """执行完整的 REST 诊断链
+
+    优先走 Batch API（一次往返）；旧站点或子项失败时回退到
+    逐项探测，保留详细的错误提示。
+
+    Returns:
+        REST 链路整体是否可用
+    """
+    batch_result = test_rest_api_batch(session, base_url)
+    if batch_result is not None:
+        return batch_result
+
+    if not test_rest_api_availability(session, base_url):
+        return False
+    if not test_rest_api_authentication(session, base_url):
+        return False
+    return test_rest_api_post_creation(session, base_url)
+
+
+def test_xmlrpc_availability(session, url):
+    """测试 XML-RPC 端点是否存在"""
     print(f"\n4. 测试 XML-RPC 端点是否可访问...")
     print(f"   URL: {url}")
 
     try:
-        response = requests.post(
-            url,
-            data='<?xml version="1.0"?><methodCall><methodName>demo.sayHello</methodName></methodCall>',
-            headers={'Content-Type': 'text/xml'},
-            timeout=10
-        )
+        # HEAD 足以判断端点是否存在：服务端不用解析 XML、
+        # 不回响应体，也不会触发安全插件对 XML-RPC POST 的拦截
+        response = session.head(url, timeout=5)
 
         print(f"   状态码: {response.status_code}")
 
         if response.status_code == 200:
             print("   ✓ XML-RPC 端点可访问")
             return True
+        elif response.status_code == 405:
+            print("   ✓ XML-RPC 端点存在（405 Method Not Allowed 是正常的）")
+            return True
         elif response.status_code == 403:
-            print("   ❌ 403 Forbidden - XML-RPC 被阻止")
+            print("   ⚠️  端点存在，但返回 403 - XML-RPC 可能被阻止")
             print("   可能原因：")
             print("   - XML-RPC 功能被禁用")
             print("   - 安全插件（如 Wordfence、iThemes Security）阻止了 XML-RPC")
             print("   - 服务器防火墙规则")
-            return False
-        elif response.status_code == 405:
-            print("   ✓ XML-RPC 端点存在（405 Method Not Allowed 是正常的）")
+            # 端点确实存在，继续做认证测试以给出更具体的诊断
             return True
         else:
             print(f"   ⚠️  意外的状态码: {response.status_code}")
@@ -188,29 +465,43 @@ def test_xmlrpc_availability(url):
         return False
 
 
-def test_xmlrpc_connection(url, username, password):
-    """测试 XML-RPC 连接"""
-    print(f"\n5. 测试 XML-RPC 认证...")
+def test_xmlrpc_connection(session, url, username, password):
+    """测试 XML-RPC 认证
 
-    try:
-        from wordpress_xmlrpc import Client
-        from wordpress_xmlrpc.methods import posts
+    直接 POST 一个极小的 wp.getUsersBlogs 调用：服务端只校验
+    凭据并返回站点列表，不像取文章那样查库、序列化整篇内容，
+    也不需要 python-wordpress-xmlrpc 库。
+    """
+    print(f"\n5. 测试 XML-RPC 认证...")
 
-        client = Client(url, username, password)
+    body = (
+        '<?xml version="1.0"?>'
+        '<methodCall><methodName>wp.getUsersBlogs</methodName><params>'
+        f'<param><value><string>{escape(username)}</string></value></param>'
+        f'<param><value><string>{escape(password)}</string></value></param>'
+        '</params></methodCall>'
+    )
 
-        # 尝试获取最近的文章
-        posts_list = client.call(posts.GetPosts({'number': 1}))
+    try:
+        response = session.post(
+            url,
+            data=body.encode('utf-8'),
+            headers={'Content-Type': 'text/xml'},
+            timeout=10
+        )
 
-        print("   ✓ XML-RPC 认证成功")
-        print(f"   已连接到站点，可以访问文章")
-        return True
+        if response.status_code == 200:
+            root = ElementTree.fromstring(response.content)
+            fault = root.find('fault')
+            if fault is None:
+                print("   ✓ XML-RPC 认证成功")
+                print(f"   凭据有效，可以访问站点")
+                return True
+            error_str = (fault.findtext('.//string') or
+                         ' '.join(''.join(fault.itertext()).split()))
+        else:
+            error_str = f"HTTP {response.status_code}"
 
-    except ImportError:
-        print("   ⚠️  未安装 python-wordpress-xmlrpc 库")
-        print("   如需使用 XML-RPC，请运行：pip install python-wordpress-xmlrpc")
-        return False
-    except Exception as e:
-        error_str = str(e)
         print(f"   ❌ XML-RPC 认证失败: {error_str}")
 
         if "403" in error_str or "Forbidden" in error_str:
@@ -228,70 +519,109 @@ def test_xmlrpc_connection(url, username, password):
 
         return False
 
+    except Exception as e:
+        print(f"   ❌ XML-RPC 认证失败: {e}")
+        return False
+
 
 def main():
+    parser = argparse.ArgumentParser(description='WordPress 连接测试工具')
+    parser.add_argument('--full', action='store_true',
+                        help='即使 REST API 可用也完整测试 XML-RPC')
+    args = parser.parse_args()
+
+    # 全程缓冲控制台输出，结束时一次性写出：几十次 print 不再
+    # 各自触发 write 系统调用，报告也保持固定顺序
+    buffer = io.StringIO()
+    router = _ThreadLocalStdout(buffer)
+    original_stdout = sys.stdout
+    sys.stdout = router
+    try:
+        return _run_diagnostics(args, router)
+    finally:
+        sys.stdout = original_stdout
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def _run_diagnostics(args, router):
+    """执行全部探测并打印报告（输出经 router 缓冲）"""
     print("=" * 70)
     print("WordPress 连接测试工具（支持 REST API 和 XML-RPC）")
     print("=" * 70)
 
     # 加载配置
-    config_file = Path("config.yaml")
-    if not config_file.exists():
+    wp_config = load_wp_config()
+    if wp_config is None:
         print("\n❌ 未找到 config.yaml 文件")
         return 1
 
-    with open(config_file, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-
-    wp_config = config.get('wordpress', {})
-
-    if not wp_config.get('enabled', False):
+    if not wp_config.enabled:
         print("\n⚠️  WordPress 功能未启用")
         return 0
 
-    url = wp_config.get('url')
-    username = wp_config.get('username')
-    password = wp_config.get('password')
-
-    # 处理 URL
-    if url.endswith('/xmlrpc.php'):
-        base_url = url[:-12]
-        xmlrpc_url = url
-    else:
-        base_url = url.rstrip('/')
-        xmlrpc_url = f"{base_url}/xmlrpc.php"
-
-    # 确保有协议前缀
-    if not base_url.startswith(('http://', 'https://')):
-        base_url = 'https://' + base_url
-        xmlrpc_url = 'https://' + xmlrpc_url
+    base_url = wp_config.base_url
+    xmlrpc_url = wp_config.xmlrpc_url
+    username = wp_config.username
+    password = wp_config.password
 
     print(f"\n配置信息:")
     print(f"  站点URL: {base_url}")
     print(f"  用户名: {username}")
     print(f"  密码: {'*' * len(password)}")
-    print(f"  API方式: {wp_config.get('api_method', 'auto')}")
+    print(f"  API方式: {wp_config.api_method}")
+
+    # 先把 DNS 解析做掉，探测建连时不再各自等待解析
+    prime_dns(base_url)
+
+    # 五次探测全打同一台主机，共用一个会话复用连接；
+    # 认证头只构造一次，挂在会话上，各探测不再各自拼 base64
+    session = make_session()
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    session.headers.update({
+        'Authorization': f'Basic {token}',
+        'Content-Type': 'application/json'
+    })
+
+    # 预热 TCP+TLS 连接，探测的耗时只反映 API 本身的响应
+    warm_connection(session, base_url)
 
     rest_ok = False
     xmlrpc_ok = False
 
-    # 测试 REST API
-    print("\n" + "=" * 70)
-    print("测试 REST API")
-    print("=" * 70)
+    # REST 与 XML-RPC 的可用性探测互不依赖，并发发出，
+    # 墙钟时间从两个串行往返降为一个
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rest_future = _submit_buffered(
+            executor, router, run_rest_tests, session, base_url)
+        xmlrpc_future = _submit_buffered(
+            executor, router, test_xmlrpc_availability, session, xmlrpc_url)
+
+        # REST 链路先出结果就先输出，不等 XML-RPC 探测收尾
+        rest_ok, rest_output = rest_future.result()
+
+        print("\n" + "=" * 70)
+        print("测试 REST API")
+        print("=" * 70)
+        sys.stdout.write(rest_output)
+
+        xmlrpc_available, xmlrpc_output = xmlrpc_future.result()
 
-    if test_rest_api_availability(base_url):
-        if test_rest_api_authentication(base_url, username, password):
-            if test_rest_api_post_creation(base_url, username, password):
-                rest_ok = True
+    # REST 正常且没有强制要求 XML-RPC 时，省掉 XML-RPC 的
+    # 认证往返——现代站点基本只需要 REST
+    skip_xmlrpc = (rest_ok and wp_config.api_method != 'xmlrpc'
+                   and not args.full)
 
     # 测试 XML-RPC
     print("\n" + "=" * 70)
     print("测试 XML-RPC")
     print("=" * 70)
+    sys.stdout.write(xmlrpc_output)
 
-    if test_xmlrpc_availability(xmlrpc_url):
-        if test_xmlrpc_connection(xmlrpc_url, username, password):
+    if skip_xmlrpc:
+        print("\n⏭️  REST API 可用，跳过 XML-RPC 认证测试（--full 可强制完整测试）")
+    elif xmlrpc_available:
+        if test_xmlrpc_connection(session, xmlrpc_url, username, password):
             xmlrpc_ok = True
 
     # 总结
@@ -308,6 +638,8 @@ def main():
     if xmlrpc_ok:
         print("✓ XML-RPC: 可用")
         print("  可以在 config.yaml 中设置: api_method: 'xmlrpc'")
+    elif skip_xmlrpc:
+        print("⏭️  XML-RPC: 未测试（REST API 已可用）")
     else:
         print("❌ XML-RPC: 不可用")
 